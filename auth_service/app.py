@@ -7,6 +7,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import config
 from routes import auth_bp
+from frame_socket import socketio
 
 
 def create_app():
@@ -18,6 +19,7 @@ def create_app():
 
 
     app.register_blueprint(auth_bp)
+    socketio.init_app(app, max_http_buffer_size=config.MAX_FRAME_BYTES)
 
 
 
@@ -38,4 +40,4 @@ if __name__ == '__main__':
     port = int(sys.argv[1]) if len(sys.argv) > 1 else config.AUTH_PORT
 
     app = create_app()
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    socketio.run(app, host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
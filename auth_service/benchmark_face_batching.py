@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tensorflow as tf
+from common.inference_batcher import InferenceBatcher
+
+
+def build_model(input_shape=(100, 100, 1), num_classes=50):
+
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input(shape=input_shape),
+        tf.keras.layers.Conv2D(32, (3, 3), activation='relu'),
+        tf.keras.layers.MaxPooling2D((2, 2)),
+        tf.keras.layers.Conv2D(64, (3, 3), activation='relu'),
+        tf.keras.layers.MaxPooling2D((2, 2)),
+        tf.keras.layers.Conv2D(64, (3, 3), activation='relu'),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(64, activation='relu'),
+        tf.keras.layers.Dropout(0.5),
+        tf.keras.layers.Dense(num_classes, activation='softmax')
+    ])
+    return tf.keras.Model(inputs=model.inputs, outputs=[model.layers[-2].output, model.outputs[0]])
+
+
+def run_officers(recognize, officers, frames_per_officer, sample):
+
+    latencies = []
+    latencies_lock = threading.Lock()
+
+    def officer():
+        for _ in range(frames_per_officer):
+            started = time.perf_counter()
+            recognize(sample)
+            with latencies_lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=officer) for _ in range(officers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return (officers * frames_per_officer / elapsed, latencies[len(latencies) // 2] * 1000,
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000)
+
+
+def main():
+
+    frames_per_officer = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    model = build_model()
+    sample = np.random.rand(100, 100, 1).astype(np.float32)
+    model.predict(sample[None], verbose=0)
+    model.predict_on_batch(np.stack([sample] * 32))
+
+    def recognize_single(image):
+        return model.predict(image[None], verbose=0)
+
+    def predict_batch(images):
+        embeddings, predictions = model.predict_on_batch(images)
+        return list(zip(np.asarray(embeddings), np.asarray(predictions)))
+
+    batcher = InferenceBatcher(predict_batch)
+    batcher.start()
+
+    print(f"{'officers':>8} | {'per-request fps':>15} {'p50 ms':>8} {'p99 ms':>8} | "
+          f"{'batched fps':>11} {'p50 ms':>8} {'p99 ms':>8}")
+    for officers in (1, 8, 32, 64):
+        single = run_officers(recognize_single, officers, frames_per_officer, sample)
+        batched = run_officers(batcher.submit, officers, frames_per_officer, sample)
+        print(f"{officers:>8} | {single[0]:>15.1f} {single[1]:>8.1f} {single[2]:>8.1f} | "
+              f"{batched[0]:>11.1f} {batched[1]:>8.1f} {batched[2]:>8.1f}")
+
+    batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
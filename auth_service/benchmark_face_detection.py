@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import FaceRecognizer
+
+
+def synthetic_frame(width, height):
+
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 255, (height // 8, width // 8, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(cv2.resize(noise, (width, height)), (0, 0), 3)
+
+
+def time_detection(detect, frame, repeats):
+
+    detect(frame)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        detect(frame)
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def main():
+
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    recognizer = FaceRecognizer('unused', background=False)
+
+    def full_resolution(frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return recognizer.face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+
+    def tracked(frame):
+        height, width = frame.shape[:2]
+        box = (width // 2 - height // 8, height // 3, height // 4, height // 4)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return recognizer.detect_in_region(gray, *recognizer.tracking_region(box, gray.shape))
+
+    print(f"{'frame':>10} {'full-res ms':>12} {'downscaled ms':>14} {'tracked ROI ms':>15}")
+    for width, height in ((1280, 720), (1920, 1080)):
+        frame = synthetic_frame(width, height)
+        full = time_detection(full_resolution, frame, repeats)
+        downscaled = time_detection(recognizer.detect_faces, frame, repeats)
+        roi = time_detection(tracked, frame, repeats)
+        print(f"{f'{width}x{height}':>10} {full:>12.1f} {downscaled:>14.1f} {roi:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
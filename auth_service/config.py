@@ -14,9 +14,27 @@ class Config:
     AUTH_DB = 'voter_auth_db'
 
     AUTH_PORT = 5003
+    AUTH_NOTIFY_CHANNEL = 'voter_auth'
+    FRAME_SOCKET_NAMESPACE = '/frames'
+    MAX_FRAME_BYTES = 2 * 1024 * 1024
 
 
     FACE_MODEL_PATH = 'models/face_model.h5'
+    FACE_INDEX_FILE = os.getenv('FACE_INDEX_FILE', 'models/face_index.bin')
+    FACE_INDEX_PARTITIONS = 1024
+    FACE_MATCH_THRESHOLD = float(os.getenv('FACE_MATCH_THRESHOLD')) if os.getenv('FACE_MATCH_THRESHOLD') else None
+    FACE_CALIBRATION_DIR = os.getenv('FACE_CALIBRATION_DIR', '../ai_training/data/calibration_faces')
+    FACE_CALIBRATION_TARGET_FAR = 0.001
+    INFERENCE_BATCH_MAX_SIZE = 32
+    INFERENCE_BATCH_MAX_LATENCY = 0.004
+    FACE_DETECTION_WIDTH = 480
+    FACE_TRACK_PADDING = 0.5
+    FACE_TRACK_REFRESH_FRAMES = 15
+    FRAME_SKIP_MAX_DIFFERENCE = 6.0
+    FRAME_SKIP_MAX_FRAMES = 10
+    RECOGNITION_VOTE_WINDOW = 5
+    RECOGNITION_SUBJECT_DIFFERENCE = 30.0
+    REGISTRATION_UPLOAD_FOLDER = os.getenv('REGISTRATION_UPLOAD_FOLDER', '../registration_service/static/images/uploads')
 
 
     UPLOAD_FOLDER = 'static/images/uploads'
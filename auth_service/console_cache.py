@@ -0,0 +1,115 @@
+import threading
+from collections import Counter, OrderedDict, deque
+import cv2
+import numpy as np
+
+
+class ConsoleCache:
+    def __init__(self, max_difference=6.0, max_skips=10, vote_window=5, subject_difference=30.0, max_consoles=256,
+                 signature_size=32):
+        self.max_difference = max_difference
+        self.subject_difference = subject_difference
+        self.max_skips = max_skips
+        self.vote_window = vote_window
+        self.max_consoles = max_consoles
+        self.signature_size = signature_size
+        self.consoles = OrderedDict()
+        self.lock = threading.Lock()
+        self.frames_processed = 0
+        self.frames_skipped = 0
+        self.voter_lookups = 0
+        self.voter_lookups_saved = 0
+        self.subject_changes = 0
+
+    def signature(self, face_image):
+
+        if len(face_image.shape) == 3:
+            face_image = cv2.cvtColor(face_image, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(face_image, (self.signature_size, self.signature_size), interpolation=cv2.INTER_AREA)
+        return small.astype(np.int16)
+
+    def get_console(self, console_id):
+
+        console = self.consoles.get(console_id)
+        if console is None:
+            console = {'signature': None, 'skips': 0, 'result': None,
+                       'votes': deque(maxlen=self.vote_window), 'voter': None}
+            self.consoles[console_id] = console
+            if len(self.consoles) > self.max_consoles:
+                self.consoles.popitem(last=False)
+        self.consoles.move_to_end(console_id)
+        return console
+
+    def lookup(self, console_id, signature):
+
+        with self.lock:
+            console = self.consoles.get(console_id)
+            if console is None or console['signature'] is None or console['skips'] >= self.max_skips:
+                return None
+            if np.abs(signature - console['signature']).mean() > self.max_difference:
+                return None
+
+            console['skips'] += 1
+            self.frames_skipped += 1
+            return console['result']
+
+    def record(self, console_id, signature, nic, confidence):
+
+        with self.lock:
+            console = self.get_console(console_id)
+            if (console['signature'] is not None and
+                    np.abs(signature - console['signature']).mean() > self.subject_difference):
+                console['votes'].clear()
+                console['result'] = None
+                console['voter'] = None
+                self.subject_changes += 1
+            console['signature'] = signature
+            console['skips'] = 0
+            console['votes'].append((nic, float(confidence)))
+            self.frames_processed += 1
+
+            counts = Counter(vote_nic for vote_nic, _ in console['votes'] if vote_nic is not None)
+            if counts:
+                leader, votes = counts.most_common(1)[0]
+                if votes * 2 > len(console['votes']):
+                    confidences = [vote_confidence for vote_nic, vote_confidence in console['votes']
+                                   if vote_nic == leader]
+                    console['result'] = (leader, sum(confidences) / len(confidences))
+                    return console['result']
+
+            console['result'] = (None, float(confidence))
+            return console['result']
+
+    def get_voter(self, console_id, nic, load_voter):
+
+        with self.lock:
+            console = self.consoles.get(console_id)
+            self.voter_lookups += 1
+            if console is not None and console['voter'] and console['voter']['nic'] == nic:
+                self.voter_lookups_saved += 1
+                return console['voter']
+
+        voter = load_voter(nic)
+        if voter and console is not None:
+            with self.lock:
+                console['voter'] = voter
+        return voter
+
+    def forget(self, console_id):
+
+        with self.lock:
+            self.consoles.pop(console_id, None)
+
+    def get_stats(self):
+
+        with self.lock:
+            frames = self.frames_processed + self.frames_skipped
+            return {
+                'frames_processed': self.frames_processed,
+                'frames_skipped': self.frames_skipped,
+                'skip_ratio': self.frames_skipped / frames if frames else 0.0,
+                'voter_lookups': self.voter_lookups,
+                'voter_lookups_saved': self.voter_lookups_saved,
+                'subject_changes': self.subject_changes,
+                'active_consoles': len(self.consoles)
+            }
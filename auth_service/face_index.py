@@ -0,0 +1,336 @@
+import os
+import threading
+import numpy as np
+from filelock import FileLock
+
+
+INDEX_MAGIC = b'FACEIDX1'
+INDEX_HEADER_BYTES = 64
+
+
+def normalize(vectors):
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def record_dtype(dimension):
+
+    return np.dtype([('nic', 'S20'), ('embedding', '<f4', (dimension,))])
+
+
+class FaceIndex:
+    def __init__(self, index_file=None, partitions=0, probe=8, partition_min_size=50000):
+        self.index_file = index_file
+        self.partitions = partitions
+        self.probe = probe
+        self.partition_min_size = partition_min_size
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.file_lock = FileLock(index_file + '.lock') if index_file else None
+        self.file_id = None
+        self.offset = 0
+        self.dimension = None
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.nics = []
+        self.size = 0
+        self.centroids = None
+        self.partition_rows = []
+        self.unpartitioned = []
+        self.load()
+
+    def __len__(self):
+        self.refresh()
+        return self.size
+
+    def load(self):
+
+        self.refresh()
+
+    def refresh(self):
+
+        if not self.index_file:
+            return
+
+        try:
+            stat = os.stat(self.index_file)
+        except FileNotFoundError:
+            return
+        if (stat.st_ino, stat.st_size) == (self.file_id, self.offset):
+            return
+
+        with self.refresh_lock:
+            reloaded = self.read_new()
+        if reloaded and self.partitions and self.size >= self.partition_min_size:
+            self.build_partitions(self.partitions)
+
+    def read_new(self):
+
+        with open(self.index_file, 'rb') as f:
+            file_id = os.fstat(f.fileno()).st_ino
+            reloaded = file_id != self.file_id
+            if reloaded:
+                self.reset()
+                self.file_id = file_id
+
+            if self.offset == 0:
+                header = f.read(INDEX_HEADER_BYTES)
+                if len(header) < INDEX_HEADER_BYTES:
+                    return reloaded
+                if header[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+                    print(f"{self.index_file} is not a face index")
+                    return reloaded
+                dimension = int(np.frombuffer(header, dtype='<u4', count=1, offset=len(INDEX_MAGIC))[0])
+                with self.lock:
+                    self.dimension = dimension
+                    self.vectors = np.zeros((0, dimension), dtype=np.float32)
+                self.offset = INDEX_HEADER_BYTES
+
+            dtype = record_dtype(self.dimension)
+            f.seek(self.offset)
+            data = f.read()
+
+        records = np.frombuffer(data[:len(data) - len(data) % dtype.itemsize], dtype=dtype)
+        if len(records):
+            self.insert([nic.decode() for nic in records['nic']], records['embedding'])
+        self.offset += records.nbytes
+        return reloaded
+
+    def reset(self):
+
+        with self.lock:
+            self.file_id = None
+            self.offset = 0
+            self.dimension = None
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+            self.nics = []
+            self.size = 0
+            self.centroids = None
+            self.partition_rows = []
+            self.unpartitioned = []
+
+    def add(self, nic, embedding):
+
+        vector = normalize(np.ravel(embedding))
+        if not self.index_file:
+            self.check_dimension(vector)
+            self.insert([nic], vector[np.newaxis])
+            return
+
+        directory = os.path.dirname(self.index_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.file_lock:
+            self.refresh()
+            self.check_dimension(vector)
+            self.append_record(nic, vector)
+            self.refresh()
+
+    def check_dimension(self, vector):
+
+        if self.dimension is not None and len(vector) != self.dimension:
+            raise ValueError(f"Expected a {self.dimension}-dimensional embedding, got {len(vector)}")
+
+    def insert(self, nics, vectors):
+
+        with self.lock:
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+                self.vectors = np.zeros((0, self.dimension), dtype=np.float32)
+
+            size = self.size + len(vectors)
+            if size > len(self.vectors):
+                grown = np.zeros((max(1024, 2 * len(self.vectors), size), self.dimension), dtype=np.float32)
+                grown[:self.size] = self.vectors[:self.size]
+                self.vectors = grown
+
+            self.vectors[self.size:size] = vectors
+            self.nics.extend(nics)
+            if self.centroids is not None:
+                self.unpartitioned.extend(range(self.size, size))
+            self.size = size
+
+    def append_record(self, nic, vector):
+
+        record = np.zeros(1, dtype=record_dtype(len(vector)))
+        record['nic'] = nic.encode()
+        record['embedding'] = vector
+        with open(self.index_file, 'ab') as f:
+            if f.tell() == 0:
+                header = INDEX_MAGIC + np.uint32(len(vector)).tobytes()
+                f.write(header.ljust(INDEX_HEADER_BYTES, b'\x00'))
+            f.write(record.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def build_partitions(self, partitions, iterations=10, sample_size=100000, chunk_size=65536):
+
+        with self.lock:
+            vectors = self.vectors[:self.size]
+        partitions = min(partitions, len(vectors))
+        if partitions < 2:
+            return
+
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+        centroids = sample[rng.choice(len(sample), partitions, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            occupied = np.bincount(assignments, minlength=partitions) > 0
+            centroids[occupied] = normalize(sums[occupied])
+
+        assignments = np.concatenate([np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+                                      for start in range(0, len(vectors), chunk_size)])
+        order = np.argsort(assignments, kind='stable')
+        bounds = np.searchsorted(assignments[order], np.arange(partitions + 1))
+
+        with self.lock:
+            self.centroids = centroids
+            self.partition_rows = [order[bounds[i]:bounds[i + 1]] for i in range(partitions)]
+            self.unpartitioned = list(range(len(vectors), self.size))
+        print(f"Partitioned {len(vectors)} face embeddings into {partitions} lists")
+
+    def search(self, embedding, k=1):
+
+        query = normalize(np.ravel(embedding))
+        self.refresh()
+        with self.lock:
+            if self.size == 0:
+                return []
+            vectors = self.vectors[:self.size]
+            nics = self.nics
+            rows = None
+            if self.centroids is not None:
+                nearest = np.argsort(self.centroids @ query)[::-1][:self.probe]
+                rows = np.concatenate([self.partition_rows[i] for i in nearest] +
+                                      [np.array(self.unpartitioned, dtype=np.int64)])
+
+        scores = vectors @ query if rows is None else vectors[rows] @ query
+        if len(scores) == 0:
+            return []
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        if rows is not None:
+            return [(nics[rows[i]], float(scores[i])) for i in top]
+        return [(nics[i], float(scores[i])) for i in top]
+
+    def get_stats(self):
+
+        self.refresh()
+        with self.lock:
+            return {
+                'enrolled': self.size,
+                'voters': len(set(self.nics)),
+                'dimension': self.dimension,
+                'partitions': 0 if self.centroids is None else len(self.centroids),
+                'unpartitioned': len(self.unpartitioned) if self.centroids is not None else self.size
+            }
+
+
+def calibrate_threshold(nics, embeddings, target_far=0.001):
+
+    vectors = normalize(embeddings)
+    nics = np.asarray(nics)
+    first, second = np.triu_indices(len(vectors), k=1)
+    scores = np.einsum('ij,ij->i', vectors[first], vectors[second])
+    same = nics[first] == nics[second]
+
+    impostor = np.sort(scores[~same])
+    genuine = scores[same]
+    if len(impostor) == 0:
+        raise ValueError("Calibration needs faces from at least two people")
+
+    accepted = int(target_far * len(impostor))
+    threshold = float(np.nextafter(impostor[len(impostor) - accepted - 1], np.float32(np.inf)))
+    return {
+        'threshold': threshold,
+        'false_accept_rate': float(np.mean(impostor >= threshold)),
+        'false_reject_rate': float(np.mean(genuine < threshold)) if len(genuine) else None,
+        'impostor_pairs': len(impostor),
+        'genuine_pairs': len(genuine)
+    }
+
+
+def calibrate(face_dir, target_far):
+
+    import sys
+    import cv2
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import config
+    from utils import FaceRecognizer
+
+    recognizer = FaceRecognizer(config.FACE_MODEL_PATH, background=False)
+    if recognizer.inference_model is None:
+        return
+
+    nics, embeddings = [], []
+    for nic in sorted(os.listdir(face_dir)):
+        person_dir = os.path.join(face_dir, nic)
+        if not os.path.isdir(person_dir):
+            continue
+        for image_name in sorted(os.listdir(person_dir)):
+            image = cv2.imread(os.path.join(person_dir, image_name))
+            if image is None:
+                continue
+            nics.append(nic)
+            embeddings.append(recognizer.embed_face(image))
+
+    report = calibrate_threshold(nics, embeddings, target_far)
+    print(f"Calibrated on {len(embeddings)} faces of {len(set(nics))} people in {face_dir}")
+    print(f"{report['impostor_pairs']} impostor pairs, {report['genuine_pairs']} genuine pairs")
+    print(f"FACE_MATCH_THRESHOLD={report['threshold']:.4f} "
+          f"(false accept rate {report['false_accept_rate']:.5f}, false reject rate {report['false_reject_rate']})")
+
+
+def rebuild_index():
+
+    import sys
+    import cv2
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import config
+    from utils import FaceRecognizer
+
+    conn = config.registration_pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT nic, face_image_path FROM voters ORDER BY id')
+            voters = cursor.fetchall()
+    finally:
+        config.registration_pool.putconn(conn)
+
+    tmp_file = config.FACE_INDEX_FILE + '.rebuild'
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    recognizer = FaceRecognizer(config.FACE_MODEL_PATH, tmp_file, background=False)
+    enrolled = 0
+    for nic, face_image_path in voters:
+        image = cv2.imread(os.path.join(config.REGISTRATION_UPLOAD_FOLDER, face_image_path))
+        if image is None:
+            print(f"Could not read face image {face_image_path} for {nic}")
+            continue
+        enrolled += recognizer.enroll_face(nic, image)
+
+    if not enrolled:
+        print(f"No faces enrolled, leaving {config.FACE_INDEX_FILE} unchanged")
+        return
+
+    os.replace(tmp_file, config.FACE_INDEX_FILE)
+    print(f"Enrolled {enrolled} of {len(voters)} voters into {config.FACE_INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'calibrate':
+        from config import config
+
+        calibrate(sys.argv[2] if len(sys.argv) > 2 else config.FACE_CALIBRATION_DIR, config.FACE_CALIBRATION_TARGET_FAR)
+    else:
+        rebuild_index()
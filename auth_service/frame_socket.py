@@ -0,0 +1,28 @@
+import cv2
+import numpy as np
+from flask import request
+from flask_socketio import SocketIO
+from config import config
+from routes import analyze_frame, face_recognizer
+
+
+socketio = SocketIO()
+
+
+@socketio.on('frame', namespace=config.FRAME_SOCKET_NAMESPACE)
+def handle_frame(data):
+    try:
+        jpeg_bytes = data['image'] if isinstance(data, dict) else data
+        nparr = np.frombuffer(jpeg_bytes, np.uint8)
+        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+        response, _ = analyze_frame(frame, request.sid)
+        return response
+
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+@socketio.on('disconnect', namespace=config.FRAME_SOCKET_NAMESPACE)
+def handle_disconnect():
+    face_recognizer.forget_console(request.sid)
@@ -2,13 +2,21 @@ from flask import Blueprint, render_template, request, jsonify
 import cv2
 import numpy as np
 import base64
+import os
+import threading
 from utils import FaceRecognizer, DatabaseManager
+from console_cache import ConsoleCache
 from config import config
 
 auth_bp = Blueprint('auth', __name__)
 
 
-face_recognizer = FaceRecognizer(config.FACE_MODEL_PATH)
+face_recognizer = FaceRecognizer(config.FACE_MODEL_PATH, config.FACE_INDEX_FILE, config.FACE_MATCH_THRESHOLD,
+                                 config.FACE_INDEX_PARTITIONS, config.INFERENCE_BATCH_MAX_SIZE,
+                                 config.INFERENCE_BATCH_MAX_LATENCY, config.FACE_DETECTION_WIDTH,
+                                 config.FACE_TRACK_PADDING, config.FACE_TRACK_REFRESH_FRAMES,
+                                 ConsoleCache(config.FRAME_SKIP_MAX_DIFFERENCE, config.FRAME_SKIP_MAX_FRAMES,
+                                              config.RECOGNITION_VOTE_WINDOW, config.RECOGNITION_SUBJECT_DIFFERENCE))
 db_manager = DatabaseManager()
 
 
@@ -22,37 +30,55 @@ def authentication():
     return render_template('authentication.html')
 
 
-@auth_bp.route('/api/process_frame', methods=['POST'])
-def process_frame():
-    try:
-        data = request.get_json()
-        image_data = data['image'].split(',')[1]
-        officer_id = data.get('officer_id', 'OFFICER_001')
+def analyze_frame(frame, console_id=None):
+    if frame is None:
+        return {'success': False, 'error': 'Could not decode frame'}, 400
 
+    if not face_recognizer.is_ready():
+        return {'success': False, 'error': 'Face model is still loading',
+                'readiness': face_recognizer.get_readiness()}, 503
 
-        nparr = np.frombuffer(base64.b64decode(image_data), np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    nic, confidence = face_recognizer.recognize_face(frame, console_id)
 
+    response = {
+        'success': True,
+        'detected': False,
+        'confidence': float(confidence) if confidence else 0.0
+    }
 
-        nic, confidence = face_recognizer.recognize_face(frame)
+    if nic:
 
-        response = {
-            'success': True,
-            'detected': False,
-            'confidence': float(confidence) if confidence else 0.0
-        }
+        if console_id is None:
+            voter_info = db_manager.get_voter_info(nic)
+        else:
+            voter_info = face_recognizer.console_cache.get_voter(console_id, nic, db_manager.get_voter_info)
+        if voter_info:
+            response.update({
+                'detected': True,
+                'voter': voter_info,
+                'confidence': float(confidence)
+            })
 
-        if nic:
+    return response, 200
 
-            voter_info = db_manager.get_voter_info(nic)
-            if voter_info:
-                response.update({
-                    'detected': True,
-                    'voter': voter_info,
-                    'confidence': float(confidence)
-                })
 
-        return jsonify(response)
+@auth_bp.route('/api/process_frame', methods=['POST'])
+def process_frame():
+    try:
+        if request.mimetype == 'image/jpeg':
+            jpeg_bytes = request.get_data()
+            client_id = request.args.get('console_id')
+        else:
+            data = request.get_json()
+            jpeg_bytes = base64.b64decode(data['image'].split(',')[1])
+            client_id = data.get('console_id')
+
+
+        nparr = np.frombuffer(jpeg_bytes, np.uint8)
+        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+        response, status = analyze_frame(frame, f'http:{client_id}' if client_id else None)
+        return jsonify(response), status
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -80,6 +106,83 @@ def confirm_authentication():
         return jsonify({'success': False, 'error': str(e)})
 
 
+def enroll_voter(nic):
+    voter_info = db_manager.get_voter_info(nic)
+    if not voter_info:
+        return 'Voter not found', 404
+
+    image = cv2.imread(os.path.join(config.REGISTRATION_UPLOAD_FOLDER, voter_info['face_image_path']))
+    if image is None:
+        return 'Registered face image not found', 404
+
+    if not face_recognizer.enroll_face(nic, image):
+        return 'No face detected in registered image', 422
+
+    return None, 200
+
+
+def drain_pending_enrollments():
+    face_recognizer.ready.wait()
+
+    pending = db_manager.get_pending_face_enrollments()
+    enrolled = 0
+    for nic in pending:
+        try:
+            error, _ = enroll_voter(nic)
+        except Exception as e:
+            error = str(e)
+        if error is None:
+            enrolled += 1
+        else:
+            print(f"Pending face enrollment for {nic} failed: {error}")
+        db_manager.resolve_face_enrollment(nic, error)
+
+    if pending:
+        print(f"Enrolled {enrolled} of {len(pending)} pending faces")
+
+
+threading.Thread(target=drain_pending_enrollments, daemon=True).start()
+
+
+@auth_bp.route('/api/enroll_face', methods=['POST'])
+def enroll_face():
+    try:
+        nic = request.get_json()['nic']
+
+        if not face_recognizer.is_ready():
+            return jsonify({'success': False, 'error': 'Face model is still loading'}), 503
+
+        error, status = enroll_voter(nic)
+        if error:
+            return jsonify({'success': False, 'error': error}), status
+
+        return jsonify({'success': True, 'enrolled': len(face_recognizer.face_index)})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@auth_bp.route('/api/face_index_stats')
+def face_index_stats():
+    return jsonify(face_recognizer.face_index.get_stats())
+
+
+@auth_bp.route('/api/inference_stats')
+def inference_stats():
+    return jsonify(face_recognizer.get_inference_stats())
+
+
+@auth_bp.route('/api/console_cache_stats')
+def console_cache_stats():
+    return jsonify(face_recognizer.console_cache.get_stats())
+
+
+@auth_bp.route('/api/ready')
+def readiness():
+    readiness = face_recognizer.get_readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+
 @auth_bp.route('/api/auth_stats')
 def auth_stats():
     stats = db_manager.get_auth_stats()
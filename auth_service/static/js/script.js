@@ -3,9 +3,19 @@ class AuthenticationApp {
         this.isRunning = false;
         this.stream = null;
         this.currentVoter = null;
+        this.socket = null;
+        this.frameInterval = 200;
+        this.consoleId = this.createConsoleId();
         this.init();
     }
 
+    createConsoleId() {
+        if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+            return window.crypto.randomUUID();
+        }
+        return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+    }
+
     init() {
         this.setupEventListeners();
     }
@@ -37,6 +47,7 @@ class AuthenticationApp {
             const video = document.getElementById('video');
             video.srcObject = this.stream;
 
+            this.connectFrameSocket();
             this.isRunning = true;
             document.getElementById('startBtn').innerHTML = '<i class="fas fa-stop"></i> Stop Authentication';
             document.getElementById('startBtn').classList.remove('btn-success');
@@ -56,6 +67,11 @@ class AuthenticationApp {
             this.stream = null;
         }
 
+        if (this.socket) {
+            this.socket.disconnect();
+            this.socket = null;
+        }
+
         this.isRunning = false;
         document.getElementById('startBtn').innerHTML = '<i class="fas fa-play"></i> Start Authentication';
         document.getElementById('startBtn').classList.remove('btn-danger');
@@ -64,9 +80,16 @@ class AuthenticationApp {
         this.hideVoterInfo();
     }
 
-    async processVideo() {
-        if (!this.isRunning) return;
+    connectFrameSocket() {
+        if (typeof io === 'undefined' || this.socket) return;
+
+        this.socket = io('/frames', { transports: ['websocket'] });
+        this.socket.on('connect_error', (error) => {
+            console.error('Frame socket unavailable, falling back to HTTP:', error);
+        });
+    }
 
+    captureFrame() {
         const video = document.getElementById('video');
         const canvas = document.getElementById('canvas');
         const context = canvas.getContext('2d');
@@ -75,17 +98,33 @@ class AuthenticationApp {
         canvas.height = video.videoHeight;
         context.drawImage(video, 0, 0, canvas.width, canvas.height);
 
-        const imageData = canvas.toDataURL('image/jpeg');
+        return new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', 0.8));
+    }
+
+    sendFrame(blob, officerId) {
+        if (this.socket && this.socket.connected) {
+            return blob.arrayBuffer().then(buffer => new Promise((resolve, reject) => {
+                this.socket.timeout(5000).emit('frame', { image: buffer, officer_id: officerId },
+                    (error, result) => error ? reject(error) : resolve(result));
+            }));
+        }
+
+        return fetch(`/api/process_frame?console_id=${encodeURIComponent(this.consoleId)}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'image/jpeg' },
+            body: blob
+        }).then(response => response.json());
+    }
+
+    async processVideo() {
+        if (!this.isRunning) return;
+
+        const started = performance.now();
         const officerId = document.getElementById('officerId').value;
 
         try {
-            const response = await fetch('/api/process_frame', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ image: imageData, officer_id: officerId })
-            });
-
-            const result = await response.json();
+            const blob = await this.captureFrame();
+            const result = await this.sendFrame(blob, officerId);
 
             if (result.success && result.detected) {
                 this.displayVoterInfo(result.voter, result.confidence);
@@ -98,7 +137,8 @@ class AuthenticationApp {
         }
 
         if (this.isRunning) {
-            setTimeout(() => this.processVideo(), 1000);
+            const delay = this.socket && this.socket.connected ? this.frameInterval : 1000;
+            setTimeout(() => this.processVideo(), Math.max(0, delay - (performance.now() - started)));
         }
     }
 
@@ -0,0 +1,61 @@
+import numpy as np
+from console_cache import ConsoleCache
+
+
+def test_unchanged_crops_reuse_the_last_result_until_max_skips():
+    cache = ConsoleCache(max_difference=6.0, max_skips=2)
+    face = np.random.default_rng(0).integers(0, 255, (120, 120, 3), dtype=np.uint8)
+    signature = cache.signature(face)
+
+    assert cache.lookup('OFFICER_001', signature) is None
+    assert cache.record('OFFICER_001', signature, 'nic_1', 0.9) == ('nic_1', 0.9)
+
+    nudged = cache.signature(np.clip(face.astype(np.int16) + 3, 0, 255).astype(np.uint8))
+    assert cache.lookup('OFFICER_001', nudged) == ('nic_1', 0.9)
+    assert cache.lookup('OFFICER_001', signature) == ('nic_1', 0.9)
+    assert cache.lookup('OFFICER_001', signature) is None
+    assert cache.lookup('OFFICER_001', cache.signature(255 - face)) is None
+    assert cache.lookup('OFFICER_002', signature) is None
+
+    stats = cache.get_stats()
+    assert stats['frames_processed'] == 1
+    assert stats['frames_skipped'] == 2
+
+
+def test_votes_stabilise_the_decision_and_cache_the_voter():
+    cache = ConsoleCache(vote_window=5)
+    signature = np.zeros((32, 32), dtype=np.int16)
+
+    assert cache.record('OFFICER_001', signature, 'nic_1', 0.8) == ('nic_1', 0.8)
+    assert cache.record('OFFICER_001', signature, 'nic_2', 0.7) == (None, 0.7)
+    assert cache.record('OFFICER_001', signature, 'nic_1', 0.6) == ('nic_1', 0.7)
+    assert cache.record('OFFICER_001', signature, None, 0.3)[0] is None
+    assert cache.record('OFFICER_001', signature, 'nic_1', 0.9)[0] == 'nic_1'
+
+    lookups = []
+
+    def load_voter(nic):
+        lookups.append(nic)
+        return {'nic': nic}
+
+    assert cache.get_voter('OFFICER_001', 'nic_1', load_voter) == {'nic': 'nic_1'}
+    assert cache.get_voter('OFFICER_001', 'nic_1', load_voter) == {'nic': 'nic_1'}
+    assert lookups == ['nic_1']
+
+    cache.forget('OFFICER_001')
+    assert cache.get_stats()['active_consoles'] == 0
+
+
+def test_a_new_face_clears_the_previous_majority():
+    cache = ConsoleCache(vote_window=5, subject_difference=30.0)
+    face = np.tile(np.linspace(0, 255, 120, dtype=np.uint8), (120, 1))
+    first = cache.signature(face)
+    second = cache.signature(face.T)
+
+    for _ in range(3):
+        cache.record('OFFICER_001', first, 'nic_1', 0.9)
+    cache.get_voter('OFFICER_001', 'nic_1', lambda nic: {'nic': nic})
+
+    assert cache.record('OFFICER_001', second, 'nic_2', 0.8) == ('nic_2', 0.8)
+    assert cache.get_voter('OFFICER_001', 'nic_2', lambda nic: {'nic': nic}) == {'nic': 'nic_2'}
+    assert cache.get_stats()['subject_changes'] == 1
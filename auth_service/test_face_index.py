@@ -0,0 +1,90 @@
+import os
+import numpy as np
+from face_index import FaceIndex, calibrate_threshold
+
+
+def test_flat_search_finds_enrolled_face_and_survives_reload(tmp_path):
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(50, 64)).astype(np.float32)
+    index_file = str(tmp_path / 'face_index.bin')
+
+    index = FaceIndex(index_file)
+    for i, embedding in enumerate(embeddings):
+        index.add(f'nic_{i}', embedding)
+
+    probe = embeddings[17] + rng.normal(scale=0.05, size=64)
+    assert index.search(probe)[0][0] == 'nic_17'
+    assert index.search(probe)[0][1] > 0.99
+
+    reloaded = FaceIndex(index_file)
+    assert len(reloaded) == 50
+    assert reloaded.search(probe, k=3)[0] == index.search(probe, k=3)[0]
+
+
+def test_partitioned_search_matches_flat_search():
+    rng = np.random.default_rng(2)
+    centers = rng.normal(size=(20, 32))
+    embeddings = np.repeat(centers, 100, axis=0) + rng.normal(scale=0.2, size=(2000, 32))
+
+    index = FaceIndex(partitions=20, probe=3)
+    for i, embedding in enumerate(embeddings):
+        index.add(f'nic_{i}', embedding)
+    flat = [index.search(embedding)[0][0] for embedding in embeddings[::97]]
+
+    index.build_partitions(20)
+    index.add('late_enrollment', embeddings[5] * 1.01)
+    assert [index.search(embedding)[0][0] for embedding in embeddings[::97]] == flat
+    assert index.get_stats()['partitions'] == 20
+    assert index.search(embeddings[5], k=2)[1][0] in ('nic_5', 'late_enrollment')
+
+
+def test_calibrated_threshold_meets_the_target_false_accept_rate():
+    rng = np.random.default_rng(3)
+    centers = rng.normal(size=(30, 64))
+    embeddings = np.repeat(centers, 10, axis=0) + rng.normal(scale=0.3, size=(300, 64))
+    nics = np.repeat([f'nic_{i}' for i in range(30)], 10)
+
+    report = calibrate_threshold(nics, embeddings, target_far=0.01)
+
+    assert report['impostor_pairs'] == 300 * 299 // 2 - 30 * 45
+    assert report['genuine_pairs'] == 30 * 45
+    assert report['false_accept_rate'] <= 0.01
+    assert report['false_reject_rate'] < 0.05
+
+
+def _enroll_in_process(index_file, worker, count):
+    from face_index import FaceIndex
+
+    index = FaceIndex(index_file)
+    rng = np.random.default_rng(worker)
+    for i in range(count):
+        index.add(f'nic_{worker}_{i}', rng.normal(size=16))
+
+
+def test_workers_share_one_index_file(tmp_path):
+    import multiprocessing
+
+    index_file = str(tmp_path / 'face_index.bin')
+    reader = FaceIndex(index_file)
+
+    processes = [multiprocessing.Process(target=_enroll_in_process, args=(index_file, worker, 25))
+                 for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert len(reader) == 100
+    assert sorted(reader.nics) == sorted(f'nic_{worker}_{i}' for worker in range(4) for i in range(25))
+    probe = np.random.default_rng(2).normal(size=16)
+    assert reader.search(probe)[0][0] == 'nic_2_0'
+
+    reader.add('late_enrollment', np.ones(16))
+    assert FaceIndex(index_file).get_stats()['enrolled'] == 101
+
+    rebuilt_file = str(tmp_path / 'face_index.bin.rebuild')
+    FaceIndex(rebuilt_file).add('rebuilt', np.ones(16))
+    os.replace(rebuilt_file, index_file)
+    assert reader.search(np.ones(16), k=5)[0][0] == 'rebuilt'
+    assert len(reader) == 1
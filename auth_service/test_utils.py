@@ -15,4 +15,47 @@ def test_extract_face_embeddings():
 
     assert processed_image.shape == (1, 100, 100, 1)
     assert processed_image.max() <= 1.0
-    assert processed_image.min() >= 0.0
\ No newline at end of file
+    assert processed_image.min() >= 0.0
+
+def test_detect_faces_downscales_and_tracks_the_last_box():
+
+    recognizer = FaceRecognizer('dummy_path', detection_width=480, track_refresh=1)
+    searched = []
+
+    def detect(image, **kwargs):
+        searched.append(image.shape)
+        if len(searched) > 3:
+            return []
+        return [(100, 50, 60, 60)] if image.shape == (270, 480) else [(48, 48, 96, 96)]
+
+    recognizer.face_cascade = MagicMock()
+    recognizer.face_cascade.detectMultiScale.side_effect = detect
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+    assert recognizer.detect_faces(frame, 'OFFICER_001') == [(400, 200, 240, 240)]
+    assert searched[0] == (270, 480)
+
+    assert recognizer.detect_faces(frame, 'OFFICER_001') == [(400, 200, 240, 240)]
+    assert searched[1] == (192, 192)
+
+    recognizer.detect_faces(frame, 'OFFICER_001')
+    assert searched[2] == (270, 480)
+
+    assert recognizer.detect_faces(frame, 'OFFICER_001') == []
+    assert recognizer.get_track('OFFICER_001') is None
+
+def test_identify_face_falls_back_to_the_classifier_without_an_index_match():
+
+    recognizer = FaceRecognizer('dummy_path')
+    recognizer.label_to_nic = {0: '199819800865', 1: '200012345678'}
+    recognizer.face_index.add('198011122233', np.eye(8)[0])
+    face = np.zeros((60, 60, 3), dtype=np.uint8)
+
+    recognizer.infer_face = lambda face_roi: (np.eye(8)[0], np.array([0.9, 0.1]))
+    assert recognizer.identify_face(face) == ('199819800865', 0.9)
+
+    recognizer.match_threshold = 0.8
+    assert recognizer.identify_face(face)[0] == '198011122233'
+
+    recognizer.infer_face = lambda face_roi: (np.eye(8)[1], np.array([0.2, 0.8]))
+    assert recognizer.identify_face(face) == ('200012345678', 0.8)
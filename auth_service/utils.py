@@ -1,27 +1,101 @@
 import cv2
 import numpy as np
+import os
 import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from config import config
-from tensorflow.keras.models import load_model
+from face_index import FaceIndex
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.inference_batcher import InferenceBatcher
+from console_cache import ConsoleCache
 
 
 class FaceRecognizer:
-    def __init__(self, model_path):
+    def __init__(self, model_path, index_file=None, match_threshold=None, partitions=0, max_batch=32,
+                 max_latency=0.004, detection_width=480, track_padding=0.5, track_refresh=15, console_cache=None,
+                 background=True):
         self.model = None
+        self.inference_model = None
+        self.batcher = InferenceBatcher(self.predict_batch, max_batch, max_latency)
+        self.face_index = FaceIndex(index_file, partitions)
+        self.match_threshold = match_threshold
         self.label_to_nic = None
         self.nic_to_label = None
         self.unique_nics = None
         self.face_cascade = cv2.CascadeClassifier(
             cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
         )
+        self.detection_width = detection_width
+        self.track_padding = track_padding
+        self.track_refresh = track_refresh
+        self.tracks = OrderedDict()
+        self.tracks_lock = threading.Lock()
+        self.max_tracks = 256
+        self.console_cache = console_cache or ConsoleCache()
+        self.ready = threading.Event()
+        self.status = 'loading'
+        self.load_seconds = None
+        self.warmup_seconds = None
+
+        if background:
+            warmup_thread = threading.Thread(target=self.warm_up, args=(model_path,))
+            warmup_thread.daemon = True
+            warmup_thread.start()
+        else:
+            self.warm_up(model_path)
+
+    def warm_up(self, model_path):
+        
+        started = time.monotonic()
         self.load_model(model_path)
+        self.load_seconds = time.monotonic() - started
+        if self.model is None:
+            self.status = 'failed'
+            return
+
+        self.status = 'warming'
+        started = time.monotonic()
+        try:
+            dummy = np.zeros((self.batcher.max_batch, 100, 100, 1), dtype=np.float32)
+            for batch_size in sorted({1, self.batcher.max_batch}):
+                self.predict_batch(dummy[:batch_size])
+        except Exception as e:
+            print(f"Face model warm-up failed: {e}")
+            self.status = 'failed'
+            return
+
+        self.warmup_seconds = time.monotonic() - started
+        self.status = 'ready'
+        self.ready.set()
+        print(f"Face model ready (load {self.load_seconds:.1f}s, warm-up {self.warmup_seconds:.1f}s)")
+
+    def is_ready(self):
+        
+        return self.ready.is_set()
+
+    def get_readiness(self):
+        
+        return {
+            'ready': self.is_ready(),
+            'status': self.status,
+            'load_seconds': self.load_seconds,
+            'warmup_seconds': self.warmup_seconds
+        }
 
     def load_model(self, model_path):
         
         try:
+            from tensorflow.keras.models import load_model, Model
+
             
             self.model = load_model(model_path)
+            self.inference_model = Model(inputs=self.model.inputs,
+                                         outputs=[self.model.layers[-2].output, self.model.outputs[0]])
 
             
             metadata_path = model_path.replace('_model.h5', '_metadata.pkl')
@@ -54,52 +128,185 @@ class FaceRecognizer:
 
         return face_normalized
 
-    def detect_faces(self, image):
+    def detect_faces(self, image, track_key=None):
         
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
             gray = image
 
+        
+        track = self.get_track(track_key)
+        if track is not None:
+            region, scale, min_size = self.tracking_region(track['box'], gray.shape)
+            faces = self.detect_in_region(gray, region, scale, min_size)
+            if len(faces):
+                self.update_track(track_key, faces[0], track['frames'] + 1)
+                return faces
+
+        height, width = gray.shape[:2]
+        faces = self.detect_in_region(gray, (0, 0, width, height), min(1.0, self.detection_width / width), 30)
+        if track_key is not None:
+            if len(faces):
+                self.update_track(track_key, faces[0], 0)
+            else:
+                self.forget_track(track_key)
+        return faces
+
+    def detect_in_region(self, gray, region, scale, min_size):
+        
+        x0, y0, x1, y1 = region
+        roi = gray[y0:y1, x0:x1]
+        if scale < 1.0:
+            roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            scale = 1.0
+
         faces = self.face_cascade.detectMultiScale(
-            gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
+            roi, scaleFactor=1.1, minNeighbors=5, minSize=(max(24, int(min_size * scale)),) * 2
         )
-        return faces
+        return [(int(x / scale) + x0, int(y / scale) + y0, int(w / scale), int(h / scale)) for x, y, w, h in faces]
+
+    def tracking_region(self, box, shape):
+        
+        x, y, w, h = box
+        pad_x, pad_y = int(w * self.track_padding), int(h * self.track_padding)
+        region = (max(0, x - pad_x), max(0, y - pad_y), min(shape[1], x + w + pad_x), min(shape[0], y + h + pad_y))
+        return region, min(1.0, 96 / w), w // 2
+
+    def get_track(self, track_key):
+        
+        if track_key is None:
+            return None
+        with self.tracks_lock:
+            track = self.tracks.get(track_key)
+            if track is None or track['frames'] >= self.track_refresh:
+                return None
+            return track
+
+    def update_track(self, track_key, box, frames):
+        
+        with self.tracks_lock:
+            self.tracks[track_key] = {'box': box, 'frames': frames}
+            self.tracks.move_to_end(track_key)
+            if len(self.tracks) > self.max_tracks:
+                self.tracks.popitem(last=False)
+
+    def forget_track(self, track_key):
+        
+        with self.tracks_lock:
+            self.tracks.pop(track_key, None)
+
+    def forget_console(self, console_id):
+        
+        self.forget_track(console_id)
+        self.console_cache.forget(console_id)
+
+    def predict_batch(self, images):
+        
+        embeddings, predictions = self.inference_model.predict_on_batch(images)
+        return list(zip(np.asarray(embeddings), np.asarray(predictions)))
+
+    def infer_face(self, face_image):
+        
+        return self.batcher.submit(self.extract_face_embeddings(face_image)[0].astype(np.float32))
+
+    def embed_face(self, face_image):
+        
+        return self.infer_face(face_image)[0]
+
+    def enroll_face(self, nic, image):
+        
+        if self.inference_model is None:
+            return False
+
+        faces = self.detect_faces(image)
+        if len(faces) == 0:
+            print(f"No face detected in enrollment image for {nic}")
+            return False
+
+        x, y, w, h = faces[0]
+        self.face_index.add(nic, self.embed_face(image[y:y + h, x:x + w]))
+        return True
+
+    def match_embedding(self, embedding):
+        
+        if self.match_threshold is None:
+            return None, 0.0
+
+        matches = self.face_index.search(embedding)
+        if not matches:
+            return None, 0.0
 
-    def recognize_face(self, frame):
+        nic, similarity = matches[0]
+        if similarity < self.match_threshold:
+            return None, similarity
+        return nic, similarity
+
+    def recognize_face(self, frame, track_key=None):
         
-        if self.model is None or self.label_to_nic is None:
+        if self.model is None:
             return None, 0.0
 
-        faces = self.detect_faces(frame)
+        faces = self.detect_faces(frame, track_key)
         if len(faces) == 0:
+            if track_key is not None:
+                self.console_cache.forget(track_key)
             return None, 0.0
 
         x, y, w, h = faces[0]
         face_roi = frame[y:y + h, x:x + w]
+        if track_key is None:
+            return self.identify_face(face_roi)
 
-        try:
-            
-            embedding = self.extract_face_embeddings(face_roi)
+        
+        signature = self.console_cache.signature(face_roi)
+        cached = self.console_cache.lookup(track_key, signature)
+        if cached is not None:
+            return cached
 
-            
-            predictions = self.model.predict(embedding, verbose=0)
-            confidence = np.max(predictions)
-            predicted_label = np.argmax(predictions, axis=1)[0]
+        nic, confidence = self.identify_face(face_roi)
+        return self.console_cache.record(track_key, signature, nic, confidence)
 
+    def identify_face(self, face_roi):
+        
+        try:
             
-            predicted_nic = self.label_to_nic.get(predicted_label, str(predicted_label))
+            embedding, predictions = self.infer_face(face_roi)
 
             
-            if confidence < 0.6:
-                return None, confidence
+            nic, similarity = self.match_embedding(embedding)
+            if nic is not None:
+                return nic, similarity
 
-            return predicted_nic, confidence
+            return self.classify(predictions)
 
         except Exception as e:
             print(f"Recognition error: {e}")
             return None, 0.0
 
+    def classify(self, predictions):
+        
+        if self.label_to_nic is None:
+            return None, 0.0
+
+        
+        confidence = np.max(predictions)
+        predicted_label = int(np.argmax(predictions))
+
+        
+        predicted_nic = self.label_to_nic.get(predicted_label, str(predicted_label))
+
+        
+        if confidence < 0.6:
+            return None, confidence
+
+        return predicted_nic, confidence
+
+    def get_inference_stats(self):
+        
+        return self.batcher.get_stats()
+
 
 
 class DatabaseManager:
@@ -156,6 +363,18 @@ class DatabaseManager:
                                    registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                                    )
                                ''')
+                cursor.execute('''
+                               CREATE TABLE IF NOT EXISTS pending_face_enrollments
+                               (
+                                   nic VARCHAR
+                               (
+                                   20
+                               ) PRIMARY KEY,
+                                   attempts INTEGER NOT NULL DEFAULT 1,
+                                   last_error TEXT,
+                                   queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                                   )
+                               ''')
                 conn.commit()
                 print("Registration database initialized successfully")
         except Exception as e:
@@ -201,6 +420,10 @@ class DatabaseManager:
                                    auth_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                                    )
                                ''')
+                cursor.execute('''
+                               CREATE INDEX IF NOT EXISTS idx_authentications_nic_time
+                                   ON authentications (nic, auth_time DESC)
+                               ''')
                 conn.commit()
                 print("Authentication database initialized successfully")
         except Exception as e:
@@ -247,6 +470,38 @@ class DatabaseManager:
             self.registration_pool.putconn(conn)
         return None
 
+    def get_pending_face_enrollments(self):
+        
+        conn = self.registration_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT nic FROM pending_face_enrollments ORDER BY queued_at')
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error reading pending face enrollments: {e}")
+            return []
+        finally:
+            self.registration_pool.putconn(conn)
+
+    def resolve_face_enrollment(self, nic, error=None):
+        
+        conn = self.registration_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                if error is None:
+                    cursor.execute('DELETE FROM pending_face_enrollments WHERE nic = %s', (nic,))
+                else:
+                    cursor.execute('''
+                                   UPDATE pending_face_enrollments
+                                   SET attempts = attempts + 1, last_error = %s
+                                   WHERE nic = %s
+                                   ''', (error, nic))
+                conn.commit()
+        except Exception as e:
+            print(f"Error updating pending face enrollment for {nic}: {e}")
+        finally:
+            self.registration_pool.putconn(conn)
+
     def log_authentication(self, unique_id, nic, full_name, officer_id, confidence, status):
         
         conn = self.auth_pool.getconn()
@@ -257,6 +512,7 @@ class DatabaseManager:
                                    (unique_id, nic, full_name, officer_id, confidence, status, auth_time)
                                VALUES (%s, %s, %s, %s, %s, %s, %s)
                                ''', (unique_id, nic, full_name, officer_id, confidence, status, datetime.now()))
+                cursor.execute('SELECT pg_notify(%s, %s)', (config.AUTH_NOTIFY_CHANNEL, nic))
                 conn.commit()
                 print(f"Authentication logged for {nic}")
         except Exception as e:
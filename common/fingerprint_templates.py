@@ -0,0 +1,152 @@
+import os
+import threading
+import cv2
+import numpy as np
+from filelock import FileLock
+
+
+TEMPLATE_IMAGE_SIZE = 256
+TEMPLATE_FEATURES = 300
+DESCRIPTOR_BYTES = 32
+POINT_SCALE = 64
+
+STORE_MAGIC = b'FPTPL001'
+STORE_HEADER_BYTES = 64
+TEMPLATE_DTYPE = np.dtype([
+    ('nic', 'S20'),
+    ('count', '<u2'),
+    ('points', '<u2', (TEMPLATE_FEATURES, 2)),
+    ('descriptors', 'u1', (TEMPLATE_FEATURES, DESCRIPTOR_BYTES))
+])
+
+
+def preprocess_fingerprint(image):
+
+    if len(image.shape) == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    image = cv2.resize(image, (TEMPLATE_IMAGE_SIZE, TEMPLATE_IMAGE_SIZE))
+    return cv2.equalizeHist(image)
+
+
+def extract_template(image):
+
+    orb = cv2.ORB_create(nfeatures=TEMPLATE_FEATURES, edgeThreshold=15, patchSize=15)
+    keypoints, descriptors = orb.detectAndCompute(preprocess_fingerprint(image), None)
+    if descriptors is None:
+        return np.zeros((0, 2), dtype=np.float32), np.zeros((0, DESCRIPTOR_BYTES), dtype=np.uint8)
+    return np.float32([keypoint.pt for keypoint in keypoints]), descriptors
+
+
+def pack_template(nic, template):
+
+    points, descriptors = template
+    count = min(len(descriptors), TEMPLATE_FEATURES)
+    record = np.zeros(1, dtype=TEMPLATE_DTYPE)
+    record['nic'] = nic.encode()
+    record['count'] = count
+    record['points'][0, :count] = np.round(points[:count] * POINT_SCALE)
+    record['descriptors'][0, :count] = descriptors[:count]
+    return record
+
+
+def unpack_template(record):
+
+    count = int(record['count'])
+    points = record['points'][:count].astype(np.float32) / POINT_SCALE
+    return points, np.array(record['descriptors'][:count])
+
+
+class TemplateStoreWriter:
+    def __init__(self, store_file):
+        self.store_file = store_file
+        directory = os.path.dirname(store_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = FileLock(store_file + '.lock')
+
+    def append(self, nic, template):
+
+        record = pack_template(nic, template)
+        with self.lock:
+            with open(self.store_file, 'ab') as f:
+                if f.tell() == 0:
+                    f.write(STORE_MAGIC.ljust(STORE_HEADER_BYTES, b'\x00'))
+                f.write(record.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def enroll(self, nic, fingerprint_file):
+
+        image = cv2.imread(fingerprint_file, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            print(f"Could not read fingerprint image {fingerprint_file} for {nic}")
+            return False
+
+        template = extract_template(image)
+        if len(template[1]) == 0:
+            print(f"No fingerprint features found for {nic}")
+            return False
+
+        self.append(nic, template)
+        return True
+
+
+class TemplateStore:
+    def __init__(self, store_file):
+        self.store_file = store_file
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(store_file + '.lock')
+        self.records = None
+        self.index = {}
+        self.file_id = None
+        self.load()
+
+    def load(self):
+
+        try:
+            stat = os.stat(self.store_file)
+        except OSError:
+            return
+        count = (stat.st_size - STORE_HEADER_BYTES) // TEMPLATE_DTYPE.itemsize
+        if count <= 0 or (stat.st_ino, count) == self.file_id:
+            return
+
+        with self.file_lock:
+            with open(self.store_file, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                count = (stat.st_size - STORE_HEADER_BYTES) // TEMPLATE_DTYPE.itemsize
+                file_id = (stat.st_ino, count)
+                if count <= 0 or file_id == self.file_id:
+                    return
+                if f.read(len(STORE_MAGIC)) != STORE_MAGIC:
+                    print(f"{self.store_file} is not a fingerprint template store")
+                    return
+                records = np.memmap(f, dtype=TEMPLATE_DTYPE, mode='r', offset=STORE_HEADER_BYTES, shape=(count,))
+
+        if self.file_id and self.file_id[0] == stat.st_ino:
+            start, index = self.file_id[1], dict(self.index)
+        else:
+            start, index = 0, {}
+        for row, nic in enumerate(records['nic'][start:], start):
+            index[nic.decode()] = row
+
+        with self.lock:
+            self.records = records
+            self.index = index
+            self.file_id = file_id
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, nic):
+
+        with self.lock:
+            records, row = self.records, self.index.get(nic)
+        if row is None:
+            self.load()
+            with self.lock:
+                records, row = self.records, self.index.get(nic)
+            if row is None:
+                return None
+
+        return unpack_template(records[row])
@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+from collections import deque
+import numpy as np
+
+
+class PendingInference:
+    __slots__ = ('sample', 'submitted', 'done', 'result', 'error')
+
+    def __init__(self, sample):
+        self.sample = sample
+        self.submitted = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def resolve(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.done.set()
+
+
+class InferenceBatcher:
+    def __init__(self, predict_batch, max_batch=32, max_latency=0.004, submit_timeout=10, latency_window=1000):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.submit_timeout = submit_timeout
+        self.queue = queue.Queue()
+        self.is_running = False
+        self.stats_lock = threading.Lock()
+        self.started_at = time.time()
+        self.batches = 0
+        self.requests = 0
+        self.failures = 0
+        self.largest_batch = 0
+        self.inference_seconds = 0.0
+        self.latencies = deque(maxlen=latency_window)
+
+    def start(self):
+
+        if self.is_running:
+            return
+
+        self.is_running = True
+        batcher_thread = threading.Thread(target=self._batch_loop)
+        batcher_thread.daemon = True
+        batcher_thread.start()
+
+    def stop(self):
+
+        self.is_running = False
+
+    def submit(self, sample):
+
+        if not self.is_running:
+            self.start()
+
+        pending = PendingInference(sample)
+        self.queue.put(pending)
+
+        if not pending.done.wait(self.submit_timeout):
+            raise TimeoutError("Timed out waiting for batched inference")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _batch_loop(self):
+
+        while self.is_running:
+            try:
+                first = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self.run_batch(batch)
+
+    def run_batch(self, batch):
+
+        started = time.monotonic()
+        try:
+            predictions = self.predict_batch(np.stack([pending.sample for pending in batch]))
+        except Exception as e:
+            for pending in batch:
+                pending.resolve(error=e)
+            self._record_batch(batch, started, failed=True)
+            return
+
+        for pending, prediction in zip(batch, predictions):
+            pending.resolve(prediction)
+        self._record_batch(batch, started)
+
+    def _record_batch(self, batch, started, failed=False):
+
+        finished = time.monotonic()
+        with self.stats_lock:
+            self.batches += 1
+            self.requests += len(batch)
+            if failed:
+                self.failures += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.inference_seconds += finished - started
+            self.latencies.extend(finished - pending.submitted for pending in batch)
+
+    def get_stats(self):
+
+        with self.stats_lock:
+            uptime = max(time.time() - self.started_at, 1e-9)
+            latencies = sorted(self.latencies)
+            return {
+                'batches': self.batches,
+                'requests': self.requests,
+                'failures': self.failures,
+                'largest_batch': self.largest_batch,
+                'average_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'average_inference_ms': self.inference_seconds / self.batches * 1000 if self.batches else 0.0,
+                'p50_latency_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+                'p99_latency_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+                if latencies else 0.0,
+                'requests_per_second': self.requests / uptime,
+                'queue_depth': self.queue.qsize(),
+                'max_batch': self.max_batch,
+                'max_latency_ms': self.max_latency * 1000
+            }
@@ -0,0 +1,46 @@
+import threading
+
+import numpy as np
+import pytest
+
+from common.inference_batcher import InferenceBatcher
+
+
+def test_concurrent_requests_share_a_forward_pass():
+    batch_sizes = []
+
+    def predict_batch(images):
+        batch_sizes.append(len(images))
+        return images.reshape(len(images), -1).sum(axis=1, keepdims=True)
+
+    batcher = InferenceBatcher(predict_batch, max_batch=8, max_latency=0.05)
+    results = {}
+
+    def scan(i):
+        results[i] = batcher.submit(np.full((2, 2, 1), i, dtype=np.float32))
+
+    threads = [threading.Thread(target=scan, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.stop()
+
+    assert {i: float(result[0]) for i, result in results.items()} == {i: 4.0 * i for i in range(20)}
+    assert sum(batch_sizes) == 20
+    assert max(batch_sizes) <= 8 and len(batch_sizes) < 20
+
+    stats = batcher.get_stats()
+    assert stats['requests'] == 20
+    assert stats['p99_latency_ms'] >= stats['p50_latency_ms'] > 0
+
+
+def test_batch_errors_are_raised_to_every_caller():
+    def predict_batch(images):
+        raise RuntimeError('model failed')
+
+    batcher = InferenceBatcher(predict_batch)
+    with pytest.raises(RuntimeError):
+        batcher.submit(np.zeros((2, 2, 1), dtype=np.float32))
+    batcher.stop()
+    assert batcher.get_stats()['failures'] == 1
@@ -123,6 +123,19 @@ def init_registration_database():
                         )
                     ''')
 
+        cur.execute('''
+                    CREATE TABLE IF NOT EXISTS pending_face_enrollments
+                    (
+                        nic VARCHAR
+                    (
+                        20
+                    ) PRIMARY KEY,
+                        attempts INTEGER NOT NULL DEFAULT 1,
+                        last_error TEXT,
+                        queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        )
+                    ''')
+
         conn.commit()
         print("Registration database initialized successfully")
 
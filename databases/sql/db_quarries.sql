@@ -31,6 +31,14 @@ CREATE TABLE IF NOT EXISTS voters
     registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE TABLE IF NOT EXISTS pending_face_enrollments
+(
+    nic VARCHAR(20) PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    last_error TEXT,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS voters
 (
     id SERIAL PRIMARY KEY,
@@ -296,48 +296,69 @@ def api_process_frame():
         if camera_data and camera_data.get('cap'):
             ret, frame = camera_data['cap'].read()
             if ret:
-                person_count, processed_frame = camera_manager.detect_persons(frame)
-                
-                _, buffer = cv2.imencode('.jpg', processed_frame)
-                image_with_boxes = base64.b64encode(buffer).decode('utf-8')
+                return jsonify(analyze_frame(voter_nic, frame))
 
-                
-                if voter_nic in active_sessions:
-                    active_sessions[voter_nic]['last_frame'] = image_with_boxes
-                    active_sessions[voter_nic]['last_detection'] = {
-                        'person_count': person_count,
-                        'timestamp': time.time()
-                    }
-
-                
-                is_fraud = person_count >= fraud_config.FRAUD_PERSON_COUNT
+        return jsonify({'success': False, 'error': 'Camera not available'})
 
-                if is_fraud:
-                    
-                    db_manager.log_fraud_attempt(voter_nic, person_count)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
 
-                    
-                    fraud_cases[voter_nic] = {
-                        'person_count': person_count,
-                        'image_with_boxes': image_with_boxes,
-                        'status': 'pending',
-                        'timestamp': time.time()
-                    }
 
-                return jsonify({
-                    'success': True,
-                    'person_count': person_count,
-                    'is_fraud': is_fraud,
-                    'image_with_boxes': image_with_boxes,
-                    'message': f'Detected {person_count} persons' if is_fraud else 'No fraud detected'
-                })
+@fraud_bp.route('/api/stream_frame/<voter_nic>', methods=['POST'])
+def api_stream_frame(voter_nic):
+    
+    try:
+        frame = cv2.imdecode(np.frombuffer(request.get_data(), np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return jsonify({'success': False, 'error': 'Invalid JPEG frame'}), 400
 
-        return jsonify({'success': False, 'error': 'Camera not available'})
+        result = analyze_frame(voter_nic, frame)
+        result.pop('image_with_boxes')
+        return jsonify(result)
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
 
+def analyze_frame(voter_nic, frame):
+    
+    person_count, processed_frame = camera_manager.detect_persons(frame)
+    
+    _, buffer = cv2.imencode('.jpg', processed_frame)
+    image_with_boxes = base64.b64encode(buffer).decode('utf-8')
+
+    
+    if voter_nic in active_sessions:
+        active_sessions[voter_nic]['last_frame'] = image_with_boxes
+        active_sessions[voter_nic]['last_detection'] = {
+            'person_count': person_count,
+            'timestamp': time.time()
+        }
+
+    
+    is_fraud = person_count >= fraud_config.FRAUD_PERSON_COUNT
+
+    if is_fraud:
+        
+        db_manager.log_fraud_attempt(voter_nic, person_count)
+
+        
+        fraud_cases[voter_nic] = {
+            'person_count': person_count,
+            'image_with_boxes': image_with_boxes,
+            'status': 'pending',
+            'timestamp': time.time()
+        }
+
+    return {
+        'success': True,
+        'person_count': person_count,
+        'is_fraud': is_fraud,
+        'image_with_boxes': image_with_boxes,
+        'message': f'Detected {person_count} persons' if is_fraud else 'No fraud detected'
+    }
+
+
 @fraud_bp.route('/api/active_monitoring')
 def api_active_monitoring():
     
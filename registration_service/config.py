@@ -14,12 +14,14 @@ class Config:
     REGISTRATION_PASSWORD = os.getenv('REGISTRATION_PASSWORD', 'admin123')
 
     REGISTRATION_PORT = 5001
+    AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://localhost:5003')
 
     CENTRAL_DB = 'central_voter_db'
     REGISTRATION_DB = 'voter_registration_db'
     VALIDITY_DB = 'voter_validity_db'
 
     UPLOAD_FOLDER = 'static/images/uploads'
+    TEMPLATE_STORE_FILE = os.getenv('TEMPLATE_STORE_FILE', 'data/fingerprint_templates.bin')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 
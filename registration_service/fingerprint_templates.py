@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fingerprint_templates import TemplateStoreWriter
+
+
+def rebuild_store():
+
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import config
+    from utils import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT nic, fingerprint_path FROM voters ORDER BY id')
+            voters = cursor.fetchall()
+    finally:
+        conn.close()
+
+    tmp_file = config.TEMPLATE_STORE_FILE + '.rebuild'
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    writer = TemplateStoreWriter(tmp_file)
+    enrolled = sum(writer.enroll(nic, os.path.join(config.UPLOAD_FOLDER, fingerprint_path))
+                   for nic, fingerprint_path in voters)
+
+    with TemplateStoreWriter(config.TEMPLATE_STORE_FILE).lock:
+        os.replace(tmp_file, config.TEMPLATE_STORE_FILE)
+    print(f"Enrolled {enrolled} of {len(voters)} voters into {config.TEMPLATE_STORE_FILE}")
+
+
+if __name__ == "__main__":
+    rebuild_store()
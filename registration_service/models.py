@@ -92,4 +92,27 @@ def register_voter(unique_id, nic, full_name, address, electoral_division, dob,
         if central_conn:
             central_conn.close()
         if validity_conn:
-            validity_conn.close()
\ No newline at end of file
+            validity_conn.close()
+
+def queue_face_enrollment(nic, error):
+    print(f"Queueing face enrollment for {nic}: {error}")
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute(
+            '''INSERT INTO pending_face_enrollments (nic, last_error)
+               VALUES (%s, %s)
+               ON CONFLICT (nic) DO UPDATE
+               SET attempts = pending_face_enrollments.attempts + 1, last_error = EXCLUDED.last_error''',
+            (nic, error)
+        )
+        conn.commit()
+        cur.close()
+        return True
+    except Exception as e:
+        print(f"Error queueing face enrollment for {nic}: {e}")
+        return False
+    finally:
+        if conn:
+            conn.close()
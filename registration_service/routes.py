@@ -1,14 +1,17 @@
 from flask import Blueprint, request, jsonify, render_template, redirect, url_for, session
 import uuid
 import os
+import requests
 from werkzeug.utils import secure_filename
 from functools import wraps
 from datetime import datetime
-from models import check_nic_exists, register_voter
+from models import check_nic_exists, register_voter, queue_face_enrollment
+from fingerprint_templates import TemplateStoreWriter
 from utils import allowed_file
 from config import config
 
 registration_bp = Blueprint('registration', __name__)
+template_store = TemplateStoreWriter(config.TEMPLATE_STORE_FILE)
 
 
 def login_required(f):
@@ -134,6 +137,16 @@ def register():
 
             if register_voter(unique_id, nic, full_name, address, electoral_division, dob, face_filename,
                               fingerprint_filename):
+                try:
+                    template_store.enroll(nic, fingerprint_path)
+                except Exception as e:
+                    print(f"Error enrolling fingerprint template for {nic}: {e}")
+                try:
+                    response = requests.post(f"{config.AUTH_SERVICE_URL}/api/enroll_face", json={'nic': nic}, timeout=5)
+                    if not response.ok:
+                        queue_face_enrollment(nic, f"HTTP {response.status_code}: {response.text[:200]}")
+                except requests.exceptions.RequestException as e:
+                    queue_face_enrollment(nic, str(e))
                 return jsonify({
                     'success': True,
                     'unique_id': unique_id,
@@ -143,4 +143,34 @@ def test_register_nic_already_exists(mock_check_nic_exists, client):
     response = client.post('/register', data=data, content_type='multipart/form-data')
     assert response.status_code == 400
     assert response.json['success'] == False
-    assert 'NIC already registered' in response.json['error']
\ No newline at end of file
+    assert 'NIC already registered' in response.json['error']
+
+@patch('routes.queue_face_enrollment')
+@patch('routes.requests.post')
+@patch('routes.check_nic_exists')
+@patch('routes.register_voter')
+def test_register_queues_rejected_face_enrollment(mock_register_voter, mock_check_nic_exists, mock_post,
+                                                  mock_queue_face_enrollment, client):
+    mock_check_nic_exists.return_value = False
+    mock_register_voter.return_value = True
+    mock_post.return_value = MagicMock(ok=False, status_code=503, text='Face model is still loading')
+
+    client.post('/login', json={
+        'username': config.REGISTRATION_USER,
+        'password': config.REGISTRATION_PASSWORD
+    })
+
+    data = {
+        'nic': '199012345678',
+        'full_name': 'Test Voter',
+        'address': '123 Test St',
+        'electoral_division': 'Test Division',
+        'dob': '1990-01-01',
+        'face_image': (io.BytesIO(b'fake image data'), 'face.jpg'),
+        'fingerprint': (io.BytesIO(b'fake fingerprint data'), 'fingerprint.jpg')
+    }
+
+    response = client.post('/register', data=data, content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    mock_queue_face_enrollment.assert_called_once_with('199012345678', 'HTTP 503: Face model is still loading')
@@ -0,0 +1,81 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from chain_binary import BinaryChain, write_binary_chain
+from chain_journal import open_block
+from merkle import hash_leaf, merkle_root
+from utils import Blockchain
+
+
+def generate_chain(block_count, block_size=10):
+
+    started = datetime(2025, 9, 5, 8, 0, 0)
+    chain = []
+    previous_hash = '0'
+    for index in range(block_count):
+        block = open_block(index, previous_hash, str(started + timedelta(seconds=index * 60)))
+        for i in range(block_size if index else 0):
+            voter_nic = str(199000000000 + index * block_size + i)
+            block['votes'].append({
+                'voter_nic': voter_nic,
+                'timestamp': str(started + timedelta(seconds=index * 60, microseconds=i * 4321)),
+                'vote_id': f"vote_{index}_{voter_nic}"
+            })
+        block['merkle_root'] = merkle_root(hash_leaf(vote) for vote in block['votes'])
+        block['hash'] = Blockchain.calculate_hash(index, previous_hash, block['merkle_root'], block['timestamp'])
+        previous_hash = block['hash']
+        chain.append(block)
+    return chain
+
+
+def timed(action, repeat):
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+
+    block_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    lookups = 1000
+    chain = generate_chain(block_count)
+    heights = [random.randrange(block_count) for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = os.path.join(directory, 'vote_chain.json')
+        binary_file = os.path.join(directory, 'vote_chain.bin')
+        with open(json_file, 'w') as f:
+            json.dump(chain, f, indent=2)
+        write_binary_chain(chain, binary_file)
+
+        def json_lookups():
+            with open(json_file, 'r') as f:
+                blocks = json.load(f)
+            for height in heights:
+                blocks[height]
+
+        def binary_lookups():
+            with BinaryChain(binary_file) as blocks:
+                for height in heights:
+                    blocks.block(height)
+
+        json_ms = timed(json_lookups, 3)
+        binary_ms = timed(binary_lookups, 3)
+
+        print(f"Blocks: {block_count}, random block reads: {lookups}")
+        print(f"JSON file:    {os.path.getsize(json_file) / 1e6:8.1f} MB, open + reads {json_ms:9.1f} ms")
+        print(f"Binary file:  {os.path.getsize(binary_file) / 1e6:8.1f} MB, open + reads {binary_ms:9.1f} ms")
+        print(f"Speedup:      {json_ms / binary_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from chain_journal import VoteRecord
+
+
+def generate_votes(count, block_size=10):
+
+    started = datetime(2025, 9, 5, 8, 0, 0, 123456)
+    block_indexes = list(range(count // block_size + 2))
+    for i in range(count):
+        block_index = block_indexes[i // block_size + 1]
+        voter_nic = str(199000000000 + i * 7)
+        yield block_index, {
+            'voter_nic': voter_nic,
+            'timestamp': str(started + timedelta(microseconds=i * 1234567)),
+            'vote_id': f"vote_{block_index}_{voter_nic}"
+        }
+
+
+def measure(build, count):
+
+    gc.collect()
+    tracemalloc.start()
+    votes = build(count)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del votes
+    return current / count
+
+
+def build_dicts(count):
+
+    return [vote for _, vote in generate_votes(count)]
+
+
+def build_records(count):
+
+    return [VoteRecord.from_dict(vote, block_index) for block_index, vote in generate_votes(count)]
+
+
+def main():
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    dict_bytes = measure(build_dicts, count)
+    record_bytes = measure(build_records, count)
+
+    print(f"Votes measured: {count}")
+    print(f"dict votes:        {dict_bytes:8.1f} bytes/vote")
+    print(f"VoteRecord votes:  {record_bytes:8.1f} bytes/vote")
+    print(f"Saving:            {(1 - record_bytes / dict_bytes) * 100:8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
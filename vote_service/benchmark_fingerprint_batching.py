@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tensorflow as tf
+from common.inference_batcher import InferenceBatcher
+
+
+def build_model(input_shape=(100, 100, 1), num_classes=50):
+
+    return tf.keras.Sequential([
+        tf.keras.layers.Input(shape=input_shape),
+        tf.keras.layers.Conv2D(32, (3, 3), activation='relu'),
+        tf.keras.layers.MaxPooling2D((2, 2)),
+        tf.keras.layers.Conv2D(64, (3, 3), activation='relu'),
+        tf.keras.layers.MaxPooling2D((2, 2)),
+        tf.keras.layers.Conv2D(64, (3, 3), activation='relu'),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(64, activation='relu'),
+        tf.keras.layers.Dropout(0.5),
+        tf.keras.layers.Dense(num_classes, activation='softmax')
+    ])
+
+
+def run_booths(recognize, booths, scans_per_booth, sample):
+
+    def booth():
+        for _ in range(scans_per_booth):
+            recognize(sample)
+
+    threads = [threading.Thread(target=booth) for _ in range(booths)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return booths * scans_per_booth / (time.perf_counter() - started)
+
+
+def main():
+
+    scans_per_booth = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    model = build_model()
+    sample = np.random.rand(100, 100, 1).astype(np.float32)
+    model.predict(sample[None], verbose=0)
+    model.predict_on_batch(np.stack([sample] * 32))
+
+    predict_lock = threading.Lock()
+
+    def recognize_single(image):
+        with predict_lock:
+            return model.predict(image[None], verbose=0)[0]
+
+    batcher = InferenceBatcher(lambda images: np.asarray(model.predict_on_batch(images)))
+    batcher.start()
+
+    print(f"{'booths':>6} {'per-request req/s':>18} {'batched req/s':>14} {'p50 ms':>8} {'p99 ms':>8}")
+    for booths in (1, 8, 32):
+        single = run_booths(recognize_single, booths, scans_per_booth, sample)
+        batcher.latencies.clear()
+        batched = run_booths(batcher.submit, booths, scans_per_booth, sample)
+        stats = batcher.get_stats()
+        print(f"{booths:>6} {single:>18.1f} {batched:>14.1f} {stats['p50_latency_ms']:>8.1f} "
+              f"{stats['p99_latency_ms']:>8.1f}")
+
+    batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
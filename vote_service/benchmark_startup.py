@@ -0,0 +1,83 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EAGER_STARTUP = '''
+import json, sys, time
+started = time.perf_counter()
+import numpy as np
+import tensorflow as tf
+model = tf.keras.models.load_model(sys.argv[1].replace('.pkl', '.h5'))
+bound = time.perf_counter() - started
+image = np.random.rand(1, 100, 100, 1).astype(np.float32)
+first = time.perf_counter()
+model.predict(image, verbose=0)
+print(json.dumps({'bind_seconds': bound, 'ready_seconds': bound,
+                  'first_request_ms': (time.perf_counter() - first) * 1000}))
+'''
+
+LAZY_STARTUP = '''
+import json, sys, time
+started = time.perf_counter()
+import numpy as np
+from utils import FingerprintRecognizer
+recognizer = FingerprintRecognizer(sys.argv[1])
+bound = time.perf_counter() - started
+if not recognizer.ready.wait(600):
+    sys.exit(f'model never became ready: {recognizer.status}')
+ready = time.perf_counter() - started
+image = np.random.randint(0, 255, (120, 120), dtype=np.uint8)
+first = time.perf_counter()
+recognizer.recognize_fingerprint(image)
+print(json.dumps({'bind_seconds': bound, 'ready_seconds': ready,
+                  'first_request_ms': (time.perf_counter() - first) * 1000}))
+'''
+
+
+def build_model(model_file):
+
+    from sklearn.preprocessing import LabelEncoder
+    from benchmark_fingerprint_batching import build_model as build_cnn
+
+    model = build_cnn()
+    model.save(model_file.replace('.pkl', '.h5'))
+
+    label_encoder = LabelEncoder()
+    label_encoder.fit([f'{199000000000 + i}' for i in range(50)])
+    with open(model_file.replace('.pkl', '_metadata.pkl'), 'wb') as f:
+        pickle.dump({'label_encoder': label_encoder, 'input_shape': (100, 100, 1)}, f)
+
+
+def run(script, model_file):
+
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3')
+    output = subprocess.run([sys.executable, '-c', script, model_file], cwd=SERVICE_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_file = os.path.join(directory, 'fingerprint_model.pkl')
+        build_model(model_file)
+
+        eager = run(EAGER_STARTUP, model_file)
+        lazy = run(LAZY_STARTUP, model_file)
+
+    print(f"{'':28}{'eager import':>14}{'background warm-up':>20}")
+    print(f"{'ready to bind port (s)':28}{eager['bind_seconds']:>14.2f}{lazy['bind_seconds']:>20.2f}")
+    print(f"{'inference ready (s)':28}{eager['ready_seconds']:>14.2f}{lazy['ready_seconds']:>20.2f}")
+    print(f"{'first request (ms)':28}{eager['first_request_ms']:>14.1f}{lazy['first_request_ms']:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
 import json
 import hashlib
+import os
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chain_journal import ChainJournal, chain_to_records, records_to_chain
+from chain_binary import read_binary_chain, write_binary_chain
+from merkle import EMPTY_ROOT
+
 
 def create_genesis_block():
-    
+
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
 
-    
-    block_data = f"0{timestamp}[]0"
+
+    block_data = f"00{EMPTY_ROOT}{timestamp}"
     block_hash = hashlib.sha256(block_data.encode()).hexdigest()
 
     genesis_block = {
@@ -16,26 +23,104 @@ def create_genesis_block():
         "timestamp": timestamp,
         "votes": [],
         "previous_hash": "0",
+        "merkle_root": EMPTY_ROOT,
         "hash": block_hash
     }
 
     return [genesis_block]
 
 
+def convert_to_journal(json_file, journal_file):
+
+    with open(json_file, 'r') as f:
+        blockchain = json.load(f)
+
+    ChainJournal(journal_file).rewrite(chain_to_records(blockchain))
+
+    vote_count = sum(len(block['votes']) for block in blockchain)
+    print(f"Converted {json_file} to {journal_file} ({len(blockchain)} blocks, {vote_count} votes)")
+
+
+def export_to_json(journal_file, json_file):
+
+    blockchain = records_to_chain(ChainJournal(journal_file).replay())
+
+    with open(json_file, 'w') as f:
+        json.dump(blockchain, f, indent=2)
+
+    print(f"Exported {journal_file} to {json_file} ({len(blockchain)} blocks)")
+
+
+def load_chain_file(chain_file):
+
+    if chain_file.endswith('.jsonl'):
+        return records_to_chain(ChainJournal(chain_file).replay())
+
+    with open(chain_file, 'r') as f:
+        return json.load(f)
+
+
+def export_to_binary(chain_file, binary_file):
+
+    blockchain = load_chain_file(chain_file)
+    write_binary_chain(blockchain, binary_file)
+
+    vote_count = sum(len(block['votes']) for block in blockchain)
+    print(f"Exported {chain_file} to {binary_file} ({len(blockchain)} blocks, {vote_count} votes)")
+
+
+def import_from_binary(binary_file, journal_file):
+
+    journal = ChainJournal(journal_file)
+    if journal.exists():
+        print(f"{journal_file} already exists, refusing to overwrite it")
+        return
+
+    blockchain = read_binary_chain(binary_file)
+    journal.rewrite(chain_to_records(blockchain))
+    print(f"Imported {binary_file} to {journal_file} ({len(blockchain)} blocks)")
+
+
 def main():
-    
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'init'
+
+    if command == 'convert':
+        json_file = sys.argv[2] if len(sys.argv) > 2 else 'vote_chain.json'
+        journal_file = sys.argv[3] if len(sys.argv) > 3 else 'vote_chain.jsonl'
+        convert_to_journal(json_file, journal_file)
+        return
+
+    if command == 'export':
+        journal_file = sys.argv[2] if len(sys.argv) > 2 else 'vote_chain.jsonl'
+        json_file = sys.argv[3] if len(sys.argv) > 3 else 'vote_chain.json'
+        export_to_json(journal_file, json_file)
+        return
+
+    if command == 'binary':
+        chain_file = sys.argv[2] if len(sys.argv) > 2 else 'vote_chain.json'
+        binary_file = sys.argv[3] if len(sys.argv) > 3 else 'vote_chain.bin'
+        export_to_binary(chain_file, binary_file)
+        return
+
+    if command == 'import-binary':
+        binary_file = sys.argv[2] if len(sys.argv) > 2 else 'vote_chain.bin'
+        journal_file = sys.argv[3] if len(sys.argv) > 3 else 'vote_chain.jsonl'
+        import_from_binary(binary_file, journal_file)
+        return
+
     blockchain = create_genesis_block()
 
-    
-    import os
+    journal = ChainJournal('vote_chain.jsonl')
+    if journal.exists():
+        print("vote_chain.jsonl already exists, refusing to overwrite it")
+        return
 
-    
-    with open('vote_chain.json', 'w') as f:
-        json.dump(blockchain, f, indent=2)
+    journal.rewrite(chain_to_records(blockchain))
 
     print("Blockchain initialized successfully!")
     print(f"Genesis block hash: {blockchain[0]['hash']}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,129 @@
+import mmap
+import struct
+
+from chain_journal import VoteRecord, replace_file
+
+
+MAGIC = b'VCHAIN01'
+FILE_HEADER = struct.Struct('<8sIQQ')
+BLOCK_HEADER = struct.Struct('<QQI32s64s64s64s')
+VOTE = struct.Struct('<20s32s48s')
+
+
+def pack_text(value, width):
+
+    data = (value or '').encode()
+    if len(data) > width:
+        raise ValueError(f"'{value}' does not fit in a {width} byte field")
+    return data
+
+
+def unpack_text(data):
+
+    text = data.rstrip(b'\x00').decode()
+    return text or None
+
+
+def write_binary_chain(chain, binary_file):
+
+    vote_count = sum(len(block['votes']) for block in chain)
+
+    def write(f):
+        f.write(FILE_HEADER.pack(MAGIC, BLOCK_HEADER.size, len(chain), vote_count))
+
+        first_vote = 0
+        for block in chain:
+            f.write(BLOCK_HEADER.pack(block['index'], first_vote, len(block['votes']),
+                                      pack_text(block['timestamp'], 32),
+                                      pack_text(block['previous_hash'], 64),
+                                      pack_text(block.get('merkle_root'), 64),
+                                      pack_text(block['hash'], 64)))
+            first_vote += len(block['votes'])
+
+        for block in chain:
+            for vote in block['votes']:
+                if isinstance(vote, VoteRecord):
+                    vote = vote.to_dict()
+                f.write(VOTE.pack(pack_text(vote['voter_nic'], 20),
+                                  pack_text(vote['timestamp'], 32),
+                                  pack_text(vote['vote_id'], 48)))
+
+    replace_file(binary_file, write)
+
+
+class BinaryChain:
+    def __init__(self, binary_file):
+        self.binary_file = binary_file
+        with open(binary_file, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, block_header_size, self.block_count, self.vote_count = FILE_HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or block_header_size != BLOCK_HEADER.size:
+            self.data.close()
+            raise ValueError(f"{binary_file} is not a binary vote chain")
+
+        self.votes_offset = FILE_HEADER.size + self.block_count * BLOCK_HEADER.size
+        if len(self.data) != self.votes_offset + self.vote_count * VOTE.size:
+            self.data.close()
+            raise ValueError(f"{binary_file} is truncated")
+
+    def close(self):
+
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.block_count
+
+    def block_header(self, height):
+
+        if not 0 <= height < self.block_count:
+            raise IndexError(f"block {height} is not in the chain")
+
+        index, first_vote, vote_count, timestamp, previous_hash, merkle_root, block_hash = \
+            BLOCK_HEADER.unpack_from(self.data, FILE_HEADER.size + height * BLOCK_HEADER.size)
+        return {
+            'index': index,
+            'timestamp': unpack_text(timestamp),
+            'previous_hash': unpack_text(previous_hash),
+            'merkle_root': unpack_text(merkle_root),
+            'hash': unpack_text(block_hash),
+            'first_vote': first_vote,
+            'vote_count': vote_count
+        }
+
+    def vote(self, number):
+
+        if not 0 <= number < self.vote_count:
+            raise IndexError(f"vote {number} is not in the chain")
+
+        voter_nic, timestamp, vote_id = VOTE.unpack_from(self.data, self.votes_offset + number * VOTE.size)
+        return {
+            'voter_nic': unpack_text(voter_nic),
+            'timestamp': unpack_text(timestamp),
+            'vote_id': unpack_text(vote_id)
+        }
+
+    def block(self, height):
+
+        header = self.block_header(height)
+        first_vote = header.pop('first_vote')
+        vote_count = header.pop('vote_count')
+        header['votes'] = [self.vote(number) for number in range(first_vote, first_vote + vote_count)]
+        return header
+
+    def blocks(self):
+
+        for height in range(self.block_count):
+            yield self.block(height)
+
+
+def read_binary_chain(binary_file):
+
+    with BinaryChain(binary_file) as chain:
+        return list(chain.blocks())
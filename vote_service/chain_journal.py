@@ -0,0 +1,305 @@
+import json
+import os
+import tempfile
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from filelock import FileLock
+
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class ChainJournal:
+    def __init__(self, journal_file):
+        self.journal_file = journal_file
+        self.offset = 0
+
+        directory = os.path.dirname(journal_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = FileLock(journal_file + '.lock')
+
+    @staticmethod
+    def encode(record):
+
+        return (json.dumps(record, separators=(',', ':')) + '\n').encode()
+
+    def exists(self):
+
+        return os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > 0
+
+    def size(self):
+
+        try:
+            return os.path.getsize(self.journal_file)
+        except FileNotFoundError:
+            return 0
+
+    def has_new_data(self):
+
+        return self.size() != self.offset
+
+    def append(self, record):
+
+        self.append_many([record])
+
+    def append_many(self, records):
+
+        self.append_lines([self.encode(record) for record in records])
+
+    def append_lines(self, lines):
+
+        if not lines:
+            return
+
+        with self.lock:
+            with open(self.journal_file, 'ab') as f:
+                f.write(b''.join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+                self.offset = f.tell()
+
+    def replay(self):
+
+        self.offset = 0
+        return self.read_new(truncate_torn_tail=True)
+
+    def read_new(self, truncate_torn_tail=False):
+
+        return [record for _, record in self.read_entries(truncate_torn_tail)]
+
+    def read_entries(self, truncate_torn_tail=False):
+
+        entries = []
+        if not os.path.exists(self.journal_file):
+            return entries
+
+        with open(self.journal_file, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entries.append((self.offset, json.loads(line)))
+                except json.JSONDecodeError:
+                    raise ValueError(f"Corrupt record in {self.journal_file} at byte {self.offset}")
+                self.offset += len(line)
+
+        if truncate_torn_tail and self.offset < self.size():
+            print(f"Truncating incomplete journal tail in {self.journal_file} at byte {self.offset}")
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(self.offset)
+                f.flush()
+                os.fsync(f.fileno())
+
+        return entries
+
+    def read_first_line(self):
+
+        try:
+            with open(self.journal_file, 'rb') as f:
+                return f.readline()
+        except FileNotFoundError:
+            return b''
+
+    def read_votes(self, offset, count):
+
+        votes = []
+        if count == 0:
+            return votes
+
+        with open(self.journal_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                record = json.loads(line)
+                if record['type'] != 'vote':
+                    continue
+                votes.append(VoteRecord.from_dict(record, record['block']))
+                if len(votes) == count:
+                    break
+        return votes
+
+    def rewrite(self, records):
+
+        with self.lock:
+            replace_file(self.journal_file, lambda f: f.writelines(self.encode(record) for record in records))
+            self.offset = os.path.getsize(self.journal_file)
+
+
+def replace_file(path, write):
+
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                    suffix='.tmp', delete=False)
+    try:
+        with f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, path)
+    except BaseException:
+        if os.path.exists(f.name):
+            os.remove(f.name)
+        raise
+
+
+class VoteRecord:
+    __slots__ = ('voter_nic', 'block_index', 'timestamp_us', 'legacy')
+
+    def __init__(self, voter_nic, block_index, timestamp_us, legacy=None):
+        self.voter_nic = voter_nic
+        self.block_index = block_index
+        self.timestamp_us = timestamp_us
+        self.legacy = legacy
+
+    @classmethod
+    def from_dict(cls, vote, block_index):
+
+        timestamp = vote['timestamp']
+        vote_id = vote['vote_id']
+        try:
+            timestamp_us = (datetime.fromisoformat(timestamp) - EPOCH) // MICROSECOND
+        except ValueError:
+            return cls(vote['voter_nic'], block_index, None, (timestamp, vote_id))
+
+        record = cls(vote['voter_nic'], block_index, timestamp_us)
+        if record.timestamp != timestamp or record.vote_id != vote_id:
+            record.timestamp_us = None
+            record.legacy = (timestamp, vote_id)
+        return record
+
+    @property
+    def timestamp(self):
+        if self.legacy:
+            return self.legacy[0]
+        return str(EPOCH + timedelta(microseconds=self.timestamp_us))
+
+    @property
+    def vote_id(self):
+        if self.legacy:
+            return self.legacy[1]
+        return f"vote_{self.block_index}_{self.voter_nic}"
+
+    def to_dict(self):
+
+        return {
+            'voter_nic': self.voter_nic,
+            'timestamp': self.timestamp,
+            'vote_id': self.vote_id
+        }
+
+
+def chain_json_default(obj):
+
+    if isinstance(obj, VoteRecord):
+        return obj.to_dict()
+    if isinstance(obj, Sequence):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JournalVotes(Sequence):
+    def __init__(self, journal, offset, count):
+        self.journal = journal
+        self.offset = offset
+        self.count = count
+        self.votes = None
+
+    def load(self):
+
+        if self.votes is None:
+            self.votes = self.journal.read_votes(self.offset, self.count)
+        return self.votes
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        return self.load()[position]
+
+    def __iter__(self):
+        return iter(self.load())
+
+
+def open_block(index, previous_hash, timestamp):
+
+    return {
+        'index': index,
+        'timestamp': timestamp,
+        'votes': [],
+        'previous_hash': previous_hash,
+        'merkle_root': None,
+        'hash': None
+    }
+
+
+def vote_record(block, vote):
+
+    if isinstance(vote, VoteRecord):
+        vote = vote.to_dict()
+    return {
+        'type': 'vote',
+        'block': block['index'],
+        'voter_nic': vote['voter_nic'],
+        'timestamp': vote['timestamp'],
+        'vote_id': vote['vote_id']
+    }
+
+
+def seal_record(block):
+
+    return {
+        'type': 'seal',
+        'index': block['index'],
+        'timestamp': block['timestamp'],
+        'previous_hash': block['previous_hash'],
+        'merkle_root': block.get('merkle_root'),
+        'hash': block['hash'],
+        'vote_count': len(block['votes'])
+    }
+
+
+def chain_to_records(chain):
+
+    records = []
+    for block in chain:
+        for vote in block['votes']:
+            records.append(vote_record(block, vote))
+        if block['hash'] is not None:
+            records.append(seal_record(block))
+    return records
+
+
+def records_to_chain(records):
+
+    chain = []
+    for record in records:
+        if record['type'] == 'vote':
+            if record['block'] >= len(chain):
+                previous_hash = chain[-1]['hash'] if chain else '0'
+                chain.append(open_block(record['block'], previous_hash, record['timestamp']))
+            block = chain[record['block']]
+            block['votes'].append({
+                'voter_nic': record['voter_nic'],
+                'timestamp': record['timestamp'],
+                'vote_id': record['vote_id']
+            })
+            if 'hash' in record:
+                block['hash'] = record['hash']
+        elif record['type'] == 'seal':
+            if record['index'] >= len(chain):
+                chain.append(open_block(record['index'], record['previous_hash'], record['timestamp']))
+            block = chain[record['index']]
+            if len(block['votes']) != record['vote_count']:
+                raise ValueError(f"Seal record for block {record['index']} does not match its votes")
+            block.update({
+                'timestamp': record['timestamp'],
+                'previous_hash': record['previous_hash'],
+                'merkle_root': record['merkle_root'],
+                'hash': record['hash']
+            })
+        elif record['type'] == 'block':
+            block = open_block(record['index'], record['previous_hash'], record['timestamp'])
+            block['hash'] = record['hash']
+            chain.append(block)
+    return chain
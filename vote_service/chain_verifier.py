@@ -0,0 +1,254 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import unquote
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from chain_journal import open_block, replace_file
+from merkle import hash_leaf, merkle_root
+from utils import Blockchain
+
+
+def verify_block(block, previous_hash):
+
+    if previous_hash is None:
+        return 'the previous block is not sealed'
+    if block['previous_hash'] != previous_hash:
+        return 'previous_hash does not match the hash of the previous block'
+
+    if block['hash'] is None:
+        return None
+
+    if block.get('vote_count') is not None and block['vote_count'] != len(block['votes']):
+        return f"seal records {block['vote_count']} votes but the journal holds {len(block['votes'])}"
+
+    if block.get('merkle_root') is None:
+        expected = Blockchain.calculate_legacy_hash(block['index'], block['previous_hash'],
+                                                    block['votes'], block['timestamp'])
+    else:
+        root = merkle_root(hash_leaf(vote) for vote in block['votes'])
+        if root != block['merkle_root']:
+            return 'merkle_root does not match the block votes'
+        expected = Blockchain.calculate_hash(block['index'], block['previous_hash'], root, block['timestamp'])
+
+    if expected != block['hash']:
+        return 'hash does not match the block contents'
+    return None
+
+
+def verify_blocks(blocks, previous_hash):
+
+    for block in blocks:
+        reason = verify_block(block, previous_hash)
+        if reason:
+            return {'index': block['index'], 'reason': reason}
+        previous_hash = block['hash']
+    return None
+
+
+def add_record(chain, record):
+
+    if record['type'] == 'vote':
+        index = record['block']
+        vote = {
+            'voter_nic': record['voter_nic'],
+            'timestamp': record['timestamp'],
+            'vote_id': record['vote_id']
+        }
+        if index == len(chain):
+            previous_hash = chain[-1]['hash'] if chain else '0'
+            chain.append(open_block(index, previous_hash, record['timestamp']))
+        elif not 0 <= index < len(chain):
+            raise ValueError(f"vote for block {index} follows block {len(chain) - 1}")
+        block = chain[index]
+        block['votes'].append(vote)
+        if 'hash' in record:
+            block['hash'] = record['hash']
+    elif record['type'] == 'seal':
+        index = record['index']
+        seal = {
+            'timestamp': record['timestamp'],
+            'previous_hash': record['previous_hash'],
+            'merkle_root': record['merkle_root'],
+            'hash': record['hash'],
+            'vote_count': record['vote_count']
+        }
+        if index == len(chain):
+            chain.append(open_block(index, seal['previous_hash'], seal['timestamp']))
+        elif not 0 <= index < len(chain):
+            raise ValueError(f"seal for block {index} follows block {len(chain) - 1}")
+        chain[index].update(seal)
+    elif record['type'] == 'block':
+        if record['index'] != len(chain):
+            raise ValueError(f"block {record['index']} follows block {len(chain) - 1}")
+        block = open_block(record['index'], record['previous_hash'], record['timestamp'])
+        block['hash'] = record['hash']
+        chain.append(block)
+    else:
+        raise ValueError(f"unknown record type {record['type']!r}")
+
+
+def load_journal(journal_file):
+
+    chain = []
+    offset = 0
+    try:
+        with open(journal_file, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    add_record(chain, json.loads(line))
+                    reason = None
+                except json.JSONDecodeError:
+                    reason = 'journal record is not valid JSON'
+                except KeyError as e:
+                    reason = f"journal record is missing {e}"
+                except (ValueError, TypeError, AttributeError) as e:
+                    reason = f"journal record is malformed: {e}"
+                if reason:
+                    index = len(chain) - 1 if chain and chain[-1]['hash'] is None else len(chain)
+                    return chain, {'index': index, 'offset': offset, 'reason': reason}
+                offset += len(line)
+    except FileNotFoundError:
+        pass
+    return chain, None
+
+
+def shard_targets(shard_dir, legacy_file=None, legacy_checkpoint_file=None):
+
+    targets = {}
+    if legacy_file and os.path.exists(legacy_file):
+        targets[''] = (legacy_file, legacy_checkpoint_file)
+
+    if os.path.isdir(shard_dir):
+        for filename in sorted(os.listdir(shard_dir)):
+            if filename.endswith('.jsonl'):
+                name = filename[:-len('.jsonl')]
+                targets[unquote(name)] = (os.path.join(shard_dir, filename),
+                                          os.path.join(shard_dir, name + '.checkpoint.json'))
+    return targets
+
+
+def verify_shards(targets, workers=None, full=False):
+
+    return {division: ChainVerifier(journal_file, checkpoint_file, workers).verify(full=full)
+            for division, (journal_file, checkpoint_file) in targets.items()}
+
+
+class ChainVerifier:
+    def __init__(self, blockchain_file, checkpoint_file, workers=None, chunk_size=500):
+        self.blockchain_file = blockchain_file
+        self.checkpoint_file = checkpoint_file
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def load_checkpoint(self):
+
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save_checkpoint(self, block):
+
+        checkpoint = {
+            'height': block['index'],
+            'hash': block['hash'],
+            'verified_at': str(datetime.now())
+        }
+        replace_file(self.checkpoint_file, lambda f: f.write(json.dumps(checkpoint, indent=2).encode()))
+        return checkpoint
+
+    def load_chain(self):
+
+        return load_journal(self.blockchain_file)
+
+    def verify(self, full=False):
+
+        chain, unreadable = self.load_chain()
+        if not chain:
+            return {'valid': False, 'height': -1, 'verified_from': 0, 'verified_blocks': 0,
+                    'first_broken': unreadable or {'index': 0, 'reason': 'chain is empty'}, 'checkpoint': None}
+
+        start = 0
+        previous_hash = '0'
+        checkpoint = None if full else self.load_checkpoint()
+        if checkpoint and checkpoint['height'] < len(chain) \
+                and chain[checkpoint['height']]['hash'] == checkpoint['hash']:
+            start = checkpoint['height'] + 1
+            previous_hash = checkpoint['hash']
+        elif checkpoint:
+            print("Verified checkpoint does not match the chain, verifying from genesis")
+            checkpoint = None
+
+        first_broken = self.verify_range(chain, start, previous_hash) or unreadable
+
+        last_good = (first_broken['index'] if first_broken else len(chain)) - 1
+        while last_good >= start and chain[last_good]['hash'] is None:
+            last_good -= 1
+        if last_good >= start:
+            checkpoint = self.save_checkpoint(chain[last_good])
+
+        return {
+            'valid': first_broken is None,
+            'height': len(chain) - 1,
+            'verified_from': start,
+            'verified_blocks': len(chain) - start,
+            'first_broken': first_broken,
+            'checkpoint': checkpoint
+        }
+
+    def verify_range(self, chain, start, previous_hash):
+
+        blocks = chain[start:]
+        if len(blocks) <= self.chunk_size or self.workers == 1:
+            return verify_blocks(blocks, previous_hash)
+
+        chunks = []
+        for offset in range(0, len(blocks), self.chunk_size):
+            chunk = blocks[offset:offset + self.chunk_size]
+            chunk_previous = previous_hash if offset == 0 else blocks[offset - 1]['hash']
+            chunks.append((chunk, chunk_previous))
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(verify_blocks, *zip(*chunks))
+            for result in results:
+                if result:
+                    return result
+        return None
+
+
+def main():
+
+    from config import config
+
+    targets = shard_targets(config.CHAIN_SHARD_DIR, config.BLOCKCHAIN_FILE, config.VERIFY_CHECKPOINT_FILE)
+    args = [arg for arg in sys.argv[1:] if arg != '--full']
+    if args:
+        targets = {division: target for division, target in targets.items() if division in args}
+
+    reports = verify_shards(targets, config.VERIFY_WORKERS, full='--full' in sys.argv)
+
+    valid = True
+    for division, report in reports.items():
+        name = division or 'global chain'
+        print(f"[{name}] Verified blocks {report['verified_from']}..{report['height']}")
+        if report['valid']:
+            print(f"[{name}] Chain is valid")
+        else:
+            broken = report['first_broken']
+            where = f"block {broken['index']}"
+            if 'offset' in broken:
+                where += f" (journal byte {broken['offset']})"
+            print(f"[{name}] Chain is broken at {where}: {broken['reason']}")
+            valid = False
+    sys.exit(0 if valid else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,9 +16,43 @@ class Config:
 
 
     FINGERPRINT_MODEL_PATH = 'models/fingerprint_model.h5'
+    INFERENCE_BATCH_MAX_SIZE = 32
+    INFERENCE_BATCH_MAX_LATENCY = 0.004
+    FINGERPRINT_MATCH_THRESHOLD = float(os.getenv('FINGERPRINT_MATCH_THRESHOLD')) if os.getenv('FINGERPRINT_MATCH_THRESHOLD') else None
+    FINGERPRINT_CALIBRATION_DIR = os.getenv('FINGERPRINT_CALIBRATION_DIR', '../ai_training/data/fingerprints')
+    FINGERPRINT_CALIBRATION_TARGET_FAR = 0.001
+    REGISTRATION_UPLOAD_FOLDER = os.getenv('REGISTRATION_UPLOAD_FOLDER', '../registration_service/static/images/uploads')
+    TEMPLATE_STORE_FILE = os.getenv('TEMPLATE_STORE_FILE', '../registration_service/data/fingerprint_templates.bin')
+
+
+    BLOCKCHAIN_FILE = 'blockchain/vote_chain.jsonl'
+    LEGACY_BLOCKCHAIN_FILE = 'blockchain/vote_chain.json'
+    BLOCK_SIZE = 10
+    BLOCK_SEAL_INTERVAL = 60
+    CHAIN_SNAPSHOT_FILE = 'blockchain/vote_chain.snapshot'
+    CHAIN_SNAPSHOT_INTERVAL = 500
+    VERIFY_CHECKPOINT_FILE = 'blockchain/verify_checkpoint.json'
+    VERIFY_WORKERS = None
+    CHAIN_SHARD_DIR = 'blockchain/shards'
+    ANCHOR_CHAIN_FILE = 'blockchain/anchor_chain.jsonl'
+    ANCHOR_INTERVAL = 30
+
+
+    VOTE_BATCH_MAX_SIZE = 64
+    VOTE_BATCH_MAX_LATENCY = 0.005
+
+
+    ELIGIBILITY_CACHE_TTL = 300
+    AUTH_NOTIFY_CHANNEL = 'voter_auth'
+
+
+    FRAUD_NOTIFY_QUEUE_SIZE = 1000
+    FRAUD_NOTIFY_MAX_RETRIES = 5
+    FRAUD_NOTIFY_BACKOFF = 0.2
+
+    FRAME_RELAY_WORKERS = 4
 
 
-    BLOCKCHAIN_FILE = 'blockchain/vote_chain.json'
     UPLOAD_FOLDER = 'static/images/uploads'
 
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
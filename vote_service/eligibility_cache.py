@@ -0,0 +1,133 @@
+import select
+import threading
+import time
+
+
+class EligibilityCache:
+    def __init__(self, load_voter_info, load_auth_status, ttl=300, connect=None, channel='voter_auth',
+                 max_entries=100000):
+        self.load_voter_info = load_voter_info
+        self.load_auth_status = load_auth_status
+        self.ttl = ttl
+        self.connect = connect
+        self.channel = channel
+        self.max_entries = max_entries
+        self.entries = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.is_running = False
+        self.listening = False
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, nic):
+
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(nic)
+            if entry and entry['expires'] > now:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            generation = self.generation
+
+        voter_info = self.load_voter_info(nic)
+        approved = self.load_auth_status(nic) if voter_info else False
+        entry = {'voter': voter_info, 'approved': approved, 'expires': now + self.ttl}
+
+        with self.lock:
+            if voter_info and generation == self.generation:
+                if len(self.entries) >= self.max_entries:
+                    self.evict_expired(now)
+                self.entries[nic] = entry
+        return entry
+
+    def get_voter_info(self, nic):
+
+        return self.get(nic)['voter']
+
+    def is_approved(self, nic):
+
+        return self.get(nic)['approved']
+
+    def invalidate(self, nic=None):
+
+        with self.lock:
+            if nic is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(nic, None)
+            self.generation += 1
+            self.invalidations += 1
+
+    def evict_expired(self, now):
+
+        for nic in [nic for nic, entry in self.entries.items() if entry['expires'] <= now]:
+            del self.entries[nic]
+        if len(self.entries) >= self.max_entries:
+            self.entries.clear()
+
+    def start(self):
+
+        if self.is_running or self.connect is None:
+            return
+
+        self.is_running = True
+        listener_thread = threading.Thread(target=self._listen_loop)
+        listener_thread.daemon = True
+        listener_thread.start()
+
+    def stop(self):
+
+        self.is_running = False
+
+    def handle_notifies(self, conn):
+
+        conn.poll()
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            self.invalidate(notify.payload or None)
+
+    def _listen_loop(self):
+
+        while self.is_running:
+            conn = None
+            try:
+                conn = self.connect()
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+
+                self.invalidate()
+                self.listening = True
+                while self.is_running:
+                    if select.select([conn], [], [], 5) != ([], [], []):
+                        self.handle_notifies(conn)
+            except Exception as e:
+                print(f"Eligibility cache listener error: {e}")
+            finally:
+                self.listening = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+            if self.is_running:
+                self.invalidate()
+                time.sleep(5)
+
+    def get_stats(self):
+
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'listening': self.listening,
+                'ttl_seconds': self.ttl
+            }
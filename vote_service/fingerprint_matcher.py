@@ -0,0 +1,132 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fingerprint_templates import TemplateStore, extract_template
+
+
+def match_score(probe, template, ratio=0.8):
+
+    probe_points, probe_descriptors = probe
+    template_points, template_descriptors = template
+    if len(probe_descriptors) < 3 or len(template_descriptors) < 3:
+        return 0.0
+
+    matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+    good = [pair[0] for pair in matcher.knnMatch(probe_descriptors, template_descriptors, k=2)
+            if len(pair) == 2 and pair[0].distance < ratio * pair[1].distance]
+    if len(good) < 3:
+        return 0.0
+
+    source = probe_points[[match.queryIdx for match in good]]
+    target = template_points[[match.trainIdx for match in good]]
+    _, inliers = cv2.estimateAffinePartial2D(source, target, method=cv2.RANSAC, ransacReprojThreshold=8.0)
+    if inliers is None:
+        return 0.0
+    return float(inliers.sum()) / min(len(probe_descriptors), len(template_descriptors))
+
+
+def calibrate_threshold(nics, templates, target_far=0.001):
+
+    nics = np.asarray(nics)
+    first, second = np.triu_indices(len(templates), k=1)
+    scores = np.array([match_score(templates[i], templates[j]) for i, j in zip(first, second)])
+    same = nics[first] == nics[second]
+
+    impostor = np.sort(scores[~same])
+    genuine = scores[same]
+    if len(impostor) == 0:
+        raise ValueError("Calibration needs fingerprints from at least two people")
+
+    accepted = int(target_far * len(impostor))
+    threshold = float(np.nextafter(impostor[len(impostor) - accepted - 1], np.inf))
+    return {
+        'threshold': threshold,
+        'false_accept_rate': float(np.mean(impostor >= threshold)),
+        'false_reject_rate': float(np.mean(genuine < threshold)) if len(genuine) else None,
+        'impostor_pairs': len(impostor),
+        'genuine_pairs': len(genuine)
+    }
+
+
+def calibrate(fingerprint_dir, target_far):
+
+    nics, templates = [], []
+    for nic in sorted(os.listdir(fingerprint_dir)):
+        person_dir = os.path.join(fingerprint_dir, nic)
+        if not os.path.isdir(person_dir):
+            continue
+        for image_name in sorted(os.listdir(person_dir)):
+            image = cv2.imread(os.path.join(person_dir, image_name), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                continue
+            nics.append(nic)
+            templates.append(extract_template(image))
+
+    report = calibrate_threshold(nics, templates, target_far)
+    print(f"Calibrated on {len(templates)} fingerprints of {len(set(nics))} people in {fingerprint_dir}")
+    print(f"{report['impostor_pairs']} impostor pairs, {report['genuine_pairs']} genuine pairs")
+    print(f"FINGERPRINT_MATCH_THRESHOLD={report['threshold']:.4f} "
+          f"(false accept rate {report['false_accept_rate']:.5f}, false reject rate {report['false_reject_rate']})")
+
+
+class FingerprintVerifier:
+    def __init__(self, load_template, threshold=None, cache_size=1000):
+        self.load_template = load_template
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self.templates = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_template(self, nic):
+
+        with self.lock:
+            if nic in self.templates:
+                self.templates.move_to_end(nic)
+                return self.templates[nic]
+
+        template = self.load_template(nic)
+        if template is None:
+            return None
+
+        with self.lock:
+            self.templates[nic] = template
+            if len(self.templates) > self.cache_size:
+                self.templates.popitem(last=False)
+        return template
+
+    def forget(self, nic):
+
+        with self.lock:
+            self.templates.pop(nic, None)
+
+    def is_calibrated(self):
+
+        return self.threshold is not None
+
+    def verify(self, nic, image):
+
+        if not self.is_calibrated():
+            return False, 0.0
+
+        template = self.get_template(nic)
+        if template is None:
+            return False, 0.0
+
+        score = match_score(extract_template(image), template)
+        return score >= self.threshold, score
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'calibrate':
+        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+        from config import config
+
+        calibrate(sys.argv[2] if len(sys.argv) > 2 else config.FINGERPRINT_CALIBRATION_DIR,
+                  config.FINGERPRINT_CALIBRATION_TARGET_FAR)
+    else:
+        print("Usage: python fingerprint_matcher.py calibrate [fingerprint_dir]")
@@ -0,0 +1,120 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class FrameRelay:
+    def __init__(self, base_url, workers=4, timeout=2, session=None):
+        self.base_url = base_url
+        self.workers = workers
+        self.timeout = timeout
+        self.session = session or self.create_session(workers)
+        self.pending = {}
+        self.sending = set()
+        self.results = {}
+        self.lock = threading.Lock()
+        self.frame_ready = threading.Condition(self.lock)
+        self.is_running = False
+        self.frames_received = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.frames_failed = 0
+        self.send_seconds = 0.0
+
+    @staticmethod
+    def create_session(workers):
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def start(self):
+
+        if self.is_running:
+            return
+
+        self.is_running = True
+        for _ in range(self.workers):
+            relay_thread = threading.Thread(target=self._relay_loop)
+            relay_thread.daemon = True
+            relay_thread.start()
+
+    def stop(self):
+
+        with self.lock:
+            self.is_running = False
+            self.frame_ready.notify_all()
+
+    def submit(self, voter_nic, jpeg_bytes):
+
+        if not self.is_running:
+            self.start()
+
+        with self.lock:
+            if voter_nic in self.pending:
+                self.frames_dropped += 1
+            self.pending[voter_nic] = jpeg_bytes
+            self.frames_received += 1
+            self.frame_ready.notify()
+            return self.results.get(voter_nic)
+
+    def forget(self, voter_nic):
+
+        with self.lock:
+            self.pending.pop(voter_nic, None)
+            self.results.pop(voter_nic, None)
+
+    def _relay_loop(self):
+
+        while self.is_running:
+            with self.lock:
+                voter_nic = next((nic for nic in self.pending if nic not in self.sending), None)
+                if voter_nic is None:
+                    self.frame_ready.wait(1)
+                    continue
+                jpeg_bytes = self.pending.pop(voter_nic)
+                self.sending.add(voter_nic)
+
+            try:
+                self.send(voter_nic, jpeg_bytes)
+            finally:
+                with self.lock:
+                    self.sending.discard(voter_nic)
+                    if voter_nic in self.pending:
+                        self.frame_ready.notify()
+
+    def send(self, voter_nic, jpeg_bytes):
+
+        started = time.monotonic()
+        try:
+            response = self.session.post(f"{self.base_url}/api/stream_frame/{voter_nic}", data=jpeg_bytes,
+                                         headers={'Content-Type': 'image/jpeg'}, timeout=self.timeout)
+            result = response.json() if response.status_code == 200 else None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Frame relay to fraud service failed: {e}")
+            result = None
+
+        with self.lock:
+            self.send_seconds += time.monotonic() - started
+            if result is None:
+                self.frames_failed += 1
+                return None
+            self.frames_sent += 1
+            self.results[voter_nic] = result
+            return result
+
+    def get_stats(self):
+
+        with self.lock:
+            return {
+                'frames_received': self.frames_received,
+                'frames_sent': self.frames_sent,
+                'frames_dropped': self.frames_dropped,
+                'frames_failed': self.frames_failed,
+                'pending_voters': len(self.pending),
+                'average_send_ms': self.send_seconds / (self.frames_sent + self.frames_failed) * 1000
+                if self.frames_sent + self.frames_failed else 0.0
+            }
@@ -0,0 +1,145 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class FraudNotifier:
+    def __init__(self, base_url, max_queue=1000, max_retries=5, backoff=0.2, max_backoff=5.0, timeout=2,
+                 session=None):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.session = session or self.create_session()
+        self.retries = []
+        self.sequence = itertools.count()
+        self.pending = {}
+        self.is_running = False
+        self.stats_lock = threading.Lock()
+        self.queued = 0
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+        self.dropped = 0
+
+    @staticmethod
+    def create_session():
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def start(self):
+
+        if self.is_running:
+            return
+
+        self.is_running = True
+        notifier_thread = threading.Thread(target=self._delivery_loop)
+        notifier_thread.daemon = True
+        notifier_thread.start()
+
+    def stop(self):
+
+        self.is_running = False
+
+    def notify(self, voter_nic, action):
+
+        if not self.is_running:
+            self.start()
+
+        try:
+            self.queue.put_nowait((voter_nic, action))
+        except queue.Full:
+            with self.stats_lock:
+                self.dropped += 1
+            print(f"Fraud notification queue full, dropped {action} for {voter_nic}")
+            return False
+
+        with self.stats_lock:
+            self.queued += 1
+        return True
+
+    def _delivery_loop(self):
+
+        while self.is_running:
+            now = time.monotonic()
+            if self.retries and self.retries[0][0] <= now:
+                _, _, voter_nic = heapq.heappop(self.retries)
+                self.deliver_pending(voter_nic)
+                continue
+
+            timeout = min(1, self.retries[0][0] - now) if self.retries else 1
+            try:
+                voter_nic, action = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+            if voter_nic in self.pending:
+                self.pending[voter_nic].append((action, 0))
+                continue
+            self.pending[voter_nic] = deque([(action, 0)])
+            self.deliver_pending(voter_nic)
+
+    def deliver_pending(self, voter_nic):
+
+        pending = self.pending[voter_nic]
+        while pending:
+            action, attempt = pending[0]
+            if self.deliver(voter_nic, action, attempt) is None:
+                pending[0] = (action, attempt + 1)
+                with self.stats_lock:
+                    self.retried += 1
+                not_before = time.monotonic() + min(self.backoff * 2 ** attempt, self.max_backoff)
+                heapq.heappush(self.retries, (not_before, next(self.sequence), voter_nic))
+                return
+            pending.popleft()
+        del self.pending[voter_nic]
+
+    def deliver(self, voter_nic, action, attempt=0):
+
+        try:
+            response = self.session.post(f"{self.base_url}/api/{action}",
+                                         json={"voter_nic": voter_nic}, timeout=self.timeout)
+            if response.status_code < 500:
+                with self.stats_lock:
+                    if response.status_code == 200:
+                        self.delivered += 1
+                    else:
+                        self.failed += 1
+                if response.status_code != 200:
+                    print(f"Fraud service rejected {action} for {voter_nic}: HTTP {response.status_code}")
+                return response.status_code == 200
+        except requests.exceptions.RequestException as e:
+            print(f"Fraud service notification failed (attempt {attempt + 1}): {e}")
+
+        if attempt < self.max_retries:
+            return None
+
+        with self.stats_lock:
+            self.failed += 1
+        print(f"Giving up on {action} for {voter_nic} after {self.max_retries + 1} attempts")
+        return False
+
+    def get_stats(self):
+
+        with self.stats_lock:
+            return {
+                'queued': self.queued,
+                'delivered': self.delivered,
+                'retried': self.retried,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'queue_depth': self.queue.qsize(),
+                'retries_waiting': len(self.retries),
+                'queue_capacity': self.queue.maxsize
+            }
@@ -0,0 +1,106 @@
+import hashlib
+import json
+
+
+EMPTY_ROOT = hashlib.sha256(b'').hexdigest()
+
+
+def hash_leaf(vote):
+
+    data = json.dumps(vote, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.sha256(b'\x00' + data).hexdigest()
+
+
+def hash_node(left, right):
+
+    return hashlib.sha256(b'\x01' + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+class IncrementalMerkleTree:
+    def __init__(self, leaves=None):
+        self.frontier = []
+        self.size = 0
+        for leaf in leaves or []:
+            self.append(leaf)
+
+    def append(self, leaf_hash):
+
+        node = leaf_hash
+        level = 0
+        while level < len(self.frontier) and self.frontier[level] is not None:
+            node = hash_node(self.frontier[level], node)
+            self.frontier[level] = None
+            level += 1
+
+        if level == len(self.frontier):
+            self.frontier.append(node)
+        else:
+            self.frontier[level] = node
+
+        self.size += 1
+        return self.size - 1
+
+    def root(self):
+
+        root = None
+        for node in self.frontier:
+            if node is None:
+                continue
+            root = node if root is None else hash_node(node, root)
+        return root if root is not None else EMPTY_ROOT
+
+
+def merkle_root(leaves):
+
+    return IncrementalMerkleTree(leaves).root()
+
+
+def largest_power_of_two_below(n):
+
+    k = 1
+    while k * 2 < n:
+        k *= 2
+    return k
+
+
+def inclusion_proof(leaves, index):
+
+    leaves = list(leaves)
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"leaf {index} is not in a tree of size {len(leaves)}")
+
+    proof = []
+    while len(leaves) > 1:
+        k = largest_power_of_two_below(len(leaves))
+        if index < k:
+            proof.append(merkle_root(leaves[k:]))
+            leaves = leaves[:k]
+        else:
+            proof.append(merkle_root(leaves[:k]))
+            leaves = leaves[k:]
+            index -= k
+    proof.reverse()
+    return proof
+
+
+def verify_inclusion(leaf_hash, index, tree_size, proof, root):
+
+    if not 0 <= index < tree_size:
+        return False
+
+    fn = index
+    sn = tree_size - 1
+    node = leaf_hash
+    for sibling in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            node = hash_node(sibling, node)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            node = hash_node(node, sibling)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and node == root
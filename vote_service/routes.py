@@ -3,8 +3,12 @@ import cv2
 import numpy as np
 import base64
 from utils import FingerprintRecognizer, VoteManager
+from chain_verifier import shard_targets, verify_shards
+from fraud_notifier import FraudNotifier
+from frame_relay import FrameRelay
+from fingerprint_matcher import FingerprintVerifier
+from merkle import hash_leaf
 from config import config
-import requests
 
 
 FRAUD_SERVICE_URL = "http://localhost:5006"
@@ -13,8 +17,13 @@ FRAUD_SERVICE_ENABLED = True
 vote_bp = Blueprint('vote', __name__)
 
 
-fingerprint_recognizer = FingerprintRecognizer(config.FINGERPRINT_MODEL_PATH)
+fingerprint_recognizer = FingerprintRecognizer(config.FINGERPRINT_MODEL_PATH, config.INFERENCE_BATCH_MAX_SIZE,
+                                               config.INFERENCE_BATCH_MAX_LATENCY)
 vote_manager = VoteManager()
+fingerprint_verifier = FingerprintVerifier(vote_manager.load_fingerprint_template, config.FINGERPRINT_MATCH_THRESHOLD)
+fraud_notifier = FraudNotifier(FRAUD_SERVICE_URL, config.FRAUD_NOTIFY_QUEUE_SIZE, config.FRAUD_NOTIFY_MAX_RETRIES,
+                               config.FRAUD_NOTIFY_BACKOFF)
+frame_relay = FrameRelay(FRAUD_SERVICE_URL, config.FRAME_RELAY_WORKERS)
 
 
 @vote_bp.route('/')
@@ -77,6 +86,7 @@ def officer_override():
             return jsonify({'success': False, 'error': 'Voter has already voted'})
 
 
+        session.pop('claimed_nic', None)
         session['voter_nic'] = voter_nic
 
         return jsonify({
@@ -90,6 +100,38 @@ def officer_override():
         return jsonify({'success': False, 'error': str(e)})
 
 
+@vote_bp.route('/api/claim_identity', methods=['POST'])
+def claim_identity():
+    try:
+        data = request.get_json()
+        officer_id = data.get('officer_id')
+        voter_nic = data.get('voter_nic')
+
+        if not officer_id or not voter_nic:
+            return jsonify({'success': False, 'error': 'Officer ID and Voter NIC required'})
+
+
+        if not vote_manager.validate_officer_id(officer_id):
+            return jsonify({'success': False, 'error': 'Unauthorized officer ID'})
+
+
+        if not vote_manager.get_voter_info(voter_nic):
+            return jsonify({'success': False, 'error': 'Voter not found'})
+
+
+        session.pop('voter_nic', None)
+        session['claimed_nic'] = voter_nic
+
+        return jsonify({
+            'success': True,
+            'message': 'Scan the voter\'s fingerprint to confirm their identity',
+            'mode': 'verify'
+        })
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
 @vote_bp.route('/api/cast', methods=['POST'])
 def cast_vote():
     try:
@@ -104,6 +146,7 @@ def cast_vote():
         success, message = vote_manager.cast_vote(voter_nic, party_code)
 
         if success:
+            frame_relay.forget(voter_nic)
 
 
             return jsonify({
@@ -124,6 +167,48 @@ def vote_stats():
     return jsonify(stats)
 
 
+@vote_bp.route('/api/ingest_stats')
+def ingest_stats():
+    return jsonify(vote_manager.get_ingest_stats())
+
+
+@vote_bp.route('/api/ready')
+def readiness():
+    readiness = fingerprint_recognizer.get_readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+
+@vote_bp.route('/api/inference_stats')
+def inference_stats():
+    return jsonify(fingerprint_recognizer.get_inference_stats())
+
+
+@vote_bp.route('/api/verify_chain')
+def verify_chain():
+    targets = shard_targets(config.CHAIN_SHARD_DIR, config.BLOCKCHAIN_FILE, config.VERIFY_CHECKPOINT_FILE)
+    division = request.args.get('division')
+    if division is not None:
+        if division not in targets:
+            return jsonify({'error': 'Unknown electoral division'}), 404
+        targets = {division: targets[division]}
+
+    shards = verify_shards(targets, config.VERIFY_WORKERS, full=request.args.get('full') == '1')
+    anchor_broken = vote_manager.blockchain.verify_anchors()
+    return jsonify({
+        'valid': anchor_broken is None and all(report['valid'] for report in shards.values()),
+        'shards': shards,
+        'anchor_first_broken': anchor_broken
+    })
+
+
+@vote_bp.route('/api/receipt/<leaf_hash>')
+def vote_receipt(leaf_hash):
+    receipt = vote_manager.blockchain.get_receipt(leaf_hash)
+    if not receipt:
+        return jsonify({'error': 'Vote receipt not found'}), 404
+    return jsonify(receipt)
+
+
 @vote_bp.route('/api/check_status')
 def check_vote_status():
     voter_nic = session.get('voter_nic')
@@ -142,36 +227,20 @@ def vote_confirmation():
 
 
     blockchain = vote_manager.blockchain
-    latest_vote = None
-
-
-    for block in reversed(blockchain.chain):
-        for vote in block['votes']:
-            if vote['voter_nic'] == voter_nic:
-                latest_vote = vote
-                break
-        if latest_vote:
-            break
+    latest_vote = blockchain.find_vote(voter_nic)
 
     if not latest_vote:
         return redirect(url_for('vote.vote_dashboard'))
 
 
     total_votes = vote_manager.get_vote_stats()['total_votes']
-    vote_number = 0
-    for block in blockchain.chain:
-        for vote in block['votes']:
-            vote_number += 1
-            if vote['voter_nic'] == voter_nic:
-                break
-        if latest_vote:
-            break
+    vote_number = blockchain.get_vote_number(voter_nic)
     session.pop('voter_nic', None)
 
     return render_template('vote_confirmation.html',
                            voter_nic=voter_nic,
                            timestamp=latest_vote['timestamp'],
-                           transaction_hash=latest_vote.get('vote_id', 'N/A'),
+                           transaction_hash=hash_leaf(latest_vote),
                            total_votes=total_votes,
                            your_vote_number=vote_number)
 
@@ -181,24 +250,21 @@ def notify_fraud_service(voter_nic, action):
     if not FRAUD_SERVICE_ENABLED:
         return True
 
-    try:
-        if action == "start_monitoring":
-            response = requests.post(
-                f"{FRAUD_SERVICE_URL}/api/start_monitoring",
-                json={"voter_nic": voter_nic},
-                timeout=2
-            )
-            return response.status_code == 200
-        elif action == "stop_monitoring":
-            response = requests.post(
-                f"{FRAUD_SERVICE_URL}/api/stop_monitoring",
-                json={"voter_nic": voter_nic},
-                timeout=2
-            )
-            return response.status_code == 200
-    except requests.exceptions.RequestException as e:
-        print(f"Fraud service notification failed: {e}")
+    if action not in ("start_monitoring", "stop_monitoring"):
         return False
+    if action == "stop_monitoring":
+        frame_relay.forget(voter_nic)
+    return fraud_notifier.notify(voter_nic, action)
+
+
+@vote_bp.route('/api/fraud_notification_stats')
+def fraud_notification_stats():
+    return jsonify(fraud_notifier.get_stats())
+
+
+@vote_bp.route('/api/frame_relay_stats')
+def frame_relay_stats():
+    return jsonify(frame_relay.get_stats())
 
 
 
@@ -213,18 +279,34 @@ def process_fingerprint():
         image = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
 
 
-        nic, confidence = fingerprint_recognizer.recognize_fingerprint(image)
+        claimed_nic = session.get('claimed_nic')
+        if claimed_nic and fingerprint_verifier.is_calibrated():
+            matched, match_score = fingerprint_verifier.verify(claimed_nic, image)
+            nic, confidence = (claimed_nic if matched else None), match_score
+            mode = 'verify'
+        else:
+            if not fingerprint_recognizer.is_ready():
+                return jsonify({'success': False, 'error': 'Fingerprint model is still loading',
+                                'readiness': fingerprint_recognizer.get_readiness()}), 503
+
+            nic, confidence = fingerprint_recognizer.recognize_fingerprint(image)
+            mode = 'identify'
+            if claimed_nic and nic != claimed_nic:
+                nic = None
 
         response = {
             'success': True,
             'authenticated': False,
-            'confidence': float(confidence) if confidence else 0.0
+            'confidence': float(confidence) if confidence else 0.0,
+            'mode': mode
         }
 
+
         if nic:
 
             voter_info = vote_manager.get_voter_info(nic)
             if voter_info:
+                session.pop('claimed_nic', None)
 
                 auth_status = vote_manager.check_voter_auth_status(nic)
                 if not auth_status:
@@ -236,7 +318,8 @@ def process_fingerprint():
                     return jsonify(response)
 
 
-                if vote_manager.blockchain.has_voted(nic):
+                already_voted = vote_manager.blockchain.has_voted(nic)
+                if already_voted:
                     response.update({
                         'authenticated': True,
                         'voter': voter_info,
@@ -244,7 +327,7 @@ def process_fingerprint():
                         'already_voted': True
                     })
 
-                if not vote_manager.blockchain.has_voted(nic):
+                if not already_voted:
 
                     if FRAUD_SERVICE_ENABLED:
                         try:
@@ -253,6 +336,7 @@ def process_fingerprint():
                         except Exception as e:
                             print(f"Failed to start fraud monitoring: {e}")
 
+                    session['voter_nic'] = nic
                     response.update({
                         'authenticated': True,
                         'voter': voter_info,
@@ -271,27 +355,22 @@ def process_fingerprint():
 def send_video_frame():
 
     try:
-        data = request.get_json()
         voter_nic = session.get('voter_nic')
-        image_data = data.get('image_data')
+        if request.mimetype == 'image/jpeg':
+            jpeg_bytes = request.get_data()
+        else:
+            image_data = (request.get_json() or {}).get('image_data')
+            jpeg_bytes = base64.b64decode(image_data.split(',')[-1]) if image_data else None
 
-        if not voter_nic or not image_data:
+        if not voter_nic or not jpeg_bytes:
             return jsonify({'success': False, 'error': 'Missing parameters'})
 
         if FRAUD_SERVICE_ENABLED:
 
-            response = requests.post(
-                f"{FRAUD_SERVICE_URL}/api/process_frame",
-                json={
-                    'voter_nic': voter_nic,
-                    'image_data': image_data
-                },
-                timeout=1
-            )
-
-            if response.status_code == 200:
-                result = response.json()
+            result = frame_relay.submit(voter_nic, jpeg_bytes)
+            if result:
                 return jsonify(result)
+            return jsonify({'success': True, 'monitoring': True, 'pending': True})
 
         return jsonify({'success': True, 'monitoring': False})
 
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote, unquote
+
+from chain_journal import ChainJournal
+
+
+LEGACY_SHARD = ''
+
+
+class AnchorChain:
+    def __init__(self, anchor_file):
+        self.journal = ChainJournal(anchor_file)
+        self.lock = threading.Lock()
+        with self.lock, self.journal.lock:
+            self.anchors = [record for record in self.journal.replay() if record['type'] == 'anchor']
+
+    @staticmethod
+    def calculate_hash(index, previous_hash, heads, timestamp):
+
+        block_string = f"{index}{previous_hash}{json.dumps(heads, sort_keys=True)}{timestamp}"
+        return hashlib.sha256(block_string.encode()).hexdigest()
+
+    def sync(self):
+
+        self.anchors.extend(record for record in self.journal.read_new(truncate_torn_tail=True)
+                            if record['type'] == 'anchor')
+
+    def latest(self):
+
+        with self.lock:
+            self.sync()
+            return self.anchors[-1] if self.anchors else None
+
+    def anchor(self, heads):
+
+        with self.lock, self.journal.lock:
+            self.sync()
+            if self.anchors and self.anchors[-1]['heads'] == heads:
+                return None
+
+            index = len(self.anchors)
+            previous_hash = self.anchors[-1]['hash'] if self.anchors else '0'
+            timestamp = str(datetime.now())
+            record = {
+                'type': 'anchor',
+                'index': index,
+                'timestamp': timestamp,
+                'previous_hash': previous_hash,
+                'heads': heads,
+                'hash': self.calculate_hash(index, previous_hash, heads, timestamp)
+            }
+            self.journal.append(record)
+            self.anchors.append(record)
+            return record
+
+    def verify(self, shards):
+
+        with self.lock:
+            self.sync()
+            anchors = list(self.anchors)
+
+        previous_hash = '0'
+        for anchor in anchors:
+            if anchor['previous_hash'] != previous_hash:
+                return {'index': anchor['index'], 'reason': 'previous_hash does not match the previous anchor'}
+            expected = self.calculate_hash(anchor['index'], anchor['previous_hash'], anchor['heads'],
+                                           anchor['timestamp'])
+            if expected != anchor['hash']:
+                return {'index': anchor['index'], 'reason': 'hash does not match the anchor contents'}
+
+            for division, head in anchor['heads'].items():
+                shard = shards.get(division)
+                if shard is None or head['height'] >= len(shard.chain) \
+                        or shard.chain[head['height']]['hash'] != head['hash']:
+                    return {'index': anchor['index'],
+                            'reason': f"head of shard '{division}' is not in the shard chain"}
+            previous_hash = anchor['hash']
+        return None
+
+
+class ShardedChain:
+    def __init__(self, shard_dir, anchor_file, chain_factory, legacy_chain=None, anchor_interval=30,
+                 division_of=None):
+        self.shard_dir = shard_dir
+        self.chain_factory = chain_factory
+        self.division_of = division_of
+        self.anchor_interval = anchor_interval
+        self.anchor_chain = AnchorChain(anchor_file)
+        self.lock = threading.RLock()
+        self.shards = {}
+        self.seal_listeners = []
+        self.shard_listeners = []
+        self.is_running = False
+
+        if legacy_chain is not None:
+            self.add_shard(LEGACY_SHARD, legacy_chain)
+
+        os.makedirs(shard_dir, exist_ok=True)
+        self.discover_shards()
+
+    def shard_file(self, division):
+
+        return os.path.join(self.shard_dir, quote(division, safe='') + '.jsonl')
+
+    def discover_shards(self):
+
+        for filename in sorted(os.listdir(self.shard_dir)):
+            if filename.endswith('.jsonl'):
+                division = unquote(filename[:-len('.jsonl')])
+                if division not in self.shards:
+                    self.get_shard(division)
+
+    def add_shard(self, division, chain):
+
+        with self.lock:
+            chain.seal_listeners.append(lambda block, division=division: self.notify_sealed(division, block))
+            self.shards[division] = chain
+        for listener in self.shard_listeners:
+            listener(division, chain)
+        return chain
+
+    def get_shard(self, division):
+
+        with self.lock:
+            if division not in self.shards:
+                self.add_shard(division, self.chain_factory(self.shard_file(division)))
+            return self.shards[division]
+
+    def notify_sealed(self, division, block):
+
+        for listener in self.seal_listeners:
+            listener(division, block)
+
+    def locate(self, voter_nic):
+
+        division = self.division_of(voter_nic) if self.division_of else None
+        if division is None:
+            return self.scan(voter_nic)
+
+        for candidate in (division, LEGACY_SHARD):
+            shard = self.shards.get(candidate)
+            if shard is None and candidate != LEGACY_SHARD and os.path.exists(self.shard_file(candidate)):
+                shard = self.get_shard(candidate)
+            if shard is not None and shard.has_voted(voter_nic):
+                return candidate, shard
+        return None, None
+
+    def scan(self, voter_nic):
+
+        for division, shard in list(self.shards.items()):
+            if shard.has_voted(voter_nic):
+                return division, shard
+
+        self.discover_shards()
+        return None, None
+
+    def has_voted(self, voter_nic):
+
+        return self.locate(voter_nic)[1] is not None
+
+    def find_vote(self, voter_nic):
+
+        division, shard = self.locate(voter_nic)
+        return shard.find_vote(voter_nic) if shard else None
+
+    def get_vote_location(self, voter_nic):
+
+        division, shard = self.locate(voter_nic)
+        if shard is None:
+            return None
+        return (division,) + shard.get_vote_location(voter_nic)
+
+    def get_vote_number(self, voter_nic):
+
+        division, shard = self.locate(voter_nic)
+        return shard.get_vote_number(voter_nic) if shard else None
+
+    def get_receipt(self, leaf_hash):
+
+        self.discover_shards()
+        for division, shard in list(self.shards.items()):
+            receipt = shard.get_receipt(leaf_hash)
+            if receipt is not None:
+                receipt['division'] = division
+                return receipt
+        return None
+
+    def get_vote_count(self):
+
+        self.discover_shards()
+        return sum(shard.get_vote_count() for shard in list(self.shards.values()))
+
+    def get_division_counts(self):
+
+        self.discover_shards()
+        return {division: shard.get_vote_count() for division, shard in list(self.shards.items())}
+
+    def get_hourly_counts(self):
+
+        self.discover_shards()
+        hourly_counts = {}
+        for shard in list(self.shards.values()):
+            for hour, count in shard.get_hourly_counts().items():
+                hourly_counts[hour] = hourly_counts.get(hour, 0) + count
+        return dict(sorted(hourly_counts.items()))
+
+    def get_heads(self):
+
+        heads = {}
+        for division, shard in list(self.shards.items()):
+            with shard.lock:
+                shard.refresh()
+                head = shard.chain[-1] if shard.chain[-1]['hash'] is not None else shard.chain[-2]
+                heads[division] = {'height': head['index'], 'hash': head['hash']}
+        return heads
+
+    def anchor(self):
+
+        self.discover_shards()
+        return self.anchor_chain.anchor(self.get_heads())
+
+    def verify_anchors(self):
+
+        for shard in list(self.shards.values()):
+            shard.refresh()
+        return self.anchor_chain.verify(self.shards)
+
+    def start(self):
+
+        if self.is_running:
+            return
+
+        self.is_running = True
+        anchor_thread = threading.Thread(target=self._anchor_loop)
+        anchor_thread.daemon = True
+        anchor_thread.start()
+
+    def stop(self):
+
+        self.is_running = False
+
+    def _anchor_loop(self):
+
+        while self.is_running:
+            time.sleep(self.anchor_interval)
+            try:
+                for shard in list(self.shards.values()):
+                    shard.seal_if_due()
+                self.anchor()
+            except Exception as e:
+                print(f"Error anchoring shard heads: {e}")
@@ -15,4 +15,248 @@ def test_calculate_hash_consistency():
     hash2 = blockchain.hash(test_block)
 
     assert len(hash1) == 64
-    assert hash1 == hash2
\ No newline at end of file
+    assert hash1 == hash2
+
+def test_voter_index_tracks_appended_votes(tmp_path):
+    from utils import Blockchain
+
+    chain = Blockchain(str(tmp_path / 'vote_chain.jsonl'))
+    for i in range(12):
+        assert chain.add_vote(f'nic_{i}') is True
+
+    assert chain.add_vote('nic_3') is False
+    assert chain.has_voted('nic_11') is True
+    assert chain.has_voted('nic_99') is False
+    assert chain.get_vote_location('nic_11') == (2, 1)
+    assert chain.find_vote('nic_11')['voter_nic'] == 'nic_11'
+    assert chain.get_vote_number('nic_11') == 12
+    assert chain.get_vote_count() == 12
+
+
+def test_voter_index_rebuilt_on_load(tmp_path):
+    from utils import Blockchain
+
+    path = str(tmp_path / 'vote_chain.jsonl')
+    chain = Blockchain(path)
+    chain.add_vote('nic_a')
+    chain.add_vote('nic_b')
+
+    reloaded = Blockchain(path)
+    assert reloaded.get_vote_location('nic_b') == (1, 1)
+    assert reloaded.get_vote_number('nic_b') == 2
+
+
+def test_journal_replay_drops_torn_tail(tmp_path):
+    from utils import Blockchain
+
+    path = str(tmp_path / 'vote_chain.jsonl')
+    chain = Blockchain(path)
+    chain.add_vote('nic_a')
+    chain.add_vote('nic_b')
+    tail_root = chain.open_tree.root()
+
+    with open(path, 'ab') as f:
+        f.write(b'{"type":"vote","block":1,"voter_nic":"nic_c"')
+
+    reloaded = Blockchain(path)
+    assert reloaded.has_voted('nic_b') is True
+    assert reloaded.has_voted('nic_c') is False
+    assert reloaded.open_tree.root() == tail_root
+    assert reloaded.add_vote('nic_c') is True
+    assert Blockchain(path).has_voted('nic_c') is True
+
+
+def test_legacy_json_chain_is_converted(tmp_path):
+    import json
+    from utils import Blockchain
+
+    legacy_path = str(tmp_path / 'vote_chain.json')
+    legacy = Blockchain(str(tmp_path / 'old.jsonl'))
+    for i in range(11):
+        legacy.add_vote(f'nic_{i}')
+    legacy.export_chain(legacy_path)
+
+    chain = Blockchain(str(tmp_path / 'vote_chain.jsonl'), legacy_path)
+    with open(legacy_path) as f:
+        exported = json.load(f)
+    assert [[vote.to_dict() for vote in block['votes']] for block in chain.chain] == \
+        [block['votes'] for block in exported]
+    assert [block['hash'] for block in chain.chain] == [block['hash'] for block in exported]
+    assert chain.get_vote_location('nic_10') == (2, 0)
+
+
+def test_incremental_merkle_root_matches_recursive_definition():
+    from merkle import IncrementalMerkleTree, hash_node
+
+    def reference_root(leaves):
+        if len(leaves) == 1:
+            return leaves[0]
+        split = 1
+        while split * 2 < len(leaves):
+            split *= 2
+        return hash_node(reference_root(leaves[:split]), reference_root(leaves[split:]))
+
+    leaves = [f'{i:064x}' for i in range(1, 14)]
+    tree = IncrementalMerkleTree()
+    for size, leaf in enumerate(leaves, start=1):
+        tree.append(leaf)
+        assert tree.root() == reference_root(leaves[:size])
+
+
+def test_inclusion_proofs_verify_for_every_leaf():
+    from merkle import inclusion_proof, merkle_root, verify_inclusion
+
+    for size in range(1, 14):
+        leaves = [f'{i:064x}' for i in range(1, size + 1)]
+        root = merkle_root(leaves)
+        for index, leaf in enumerate(leaves):
+            proof = inclusion_proof(leaves, index)
+            assert verify_inclusion(leaf, index, size, proof, root)
+            assert not verify_inclusion(leaves[index - 1] if size > 1 else '00' * 32, index, size, proof, root)
+
+
+def test_sealed_blocks_keep_stable_hashes(tmp_path):
+    from utils import Blockchain
+
+    path = str(tmp_path / 'vote_chain.jsonl')
+    chain = Blockchain(path, block_size=3)
+    sealed = []
+    chain.seal_listeners.append(lambda block: sealed.append((block['index'], block['hash'])))
+
+    for i in range(7):
+        chain.add_vote(f'nic_{i}')
+
+    assert sealed == [(1, chain.chain[1]['hash']), (2, chain.chain[2]['hash'])]
+    assert chain.is_sealed(2) is True
+    assert chain.is_sealed(3) is False
+    assert chain.chain[3]['previous_hash'] == chain.chain[2]['hash']
+
+    first_hash = chain.chain[1]['hash']
+    chain.add_vote('nic_7')
+    assert chain.chain[1]['hash'] == first_hash
+
+    reloaded = Blockchain(path, block_size=3)
+    assert [block['hash'] for block in reloaded.chain] == [block['hash'] for block in chain.chain]
+    assert reloaded.get_vote_location('nic_7') == (3, 1)
+
+
+def _append_votes_in_process(path, worker, count):
+    from utils import Blockchain
+
+    chain = Blockchain(path, block_size=7)
+    for i in range(count):
+        chain.add_vote(f'nic_{worker}_{i}')
+        chain.add_vote(f'shared_{i}')
+
+
+def test_concurrent_processes_share_one_chain(tmp_path):
+    import multiprocessing
+    from merkle import hash_leaf, merkle_root
+    from utils import Blockchain
+
+    path = str(tmp_path / 'vote_chain.jsonl')
+    Blockchain(path, block_size=7)
+
+    processes = [multiprocessing.Process(target=_append_votes_in_process, args=(path, worker, 20))
+                 for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    chain = Blockchain(path, block_size=7)
+    nics = [vote.voter_nic for block in chain.chain for vote in block['votes']]
+    assert len(nics) == len(set(nics)) == 4 * 20 + 20
+
+    for previous, block in zip(chain.chain, chain.chain[1:]):
+        assert block['previous_hash'] == previous['hash']
+        if block['hash'] is not None:
+            assert len(block['votes']) == 7
+            assert block['merkle_root'] == merkle_root(hash_leaf(vote.to_dict()) for vote in block['votes'])
+
+
+def test_snapshot_restores_state_and_replays_suffix(tmp_path):
+    from utils import Blockchain
+
+    path = str(tmp_path / 'vote_chain.jsonl')
+    snapshot = str(tmp_path / 'vote_chain.snapshot')
+    chain = Blockchain(path, block_size=3, snapshot_file=snapshot, snapshot_interval=2)
+    for i in range(8):
+        chain.add_vote(f'nic_{i}')
+    chain.write_snapshot()
+    chain.add_vote('nic_8')
+    chain.add_vote('nic_9')
+
+    reloaded = Blockchain(path, block_size=3, snapshot_file=snapshot, snapshot_interval=2)
+    assert [block['hash'] for block in reloaded.chain] == [block['hash'] for block in chain.chain]
+    assert reloaded.get_vote_count() == 10
+    assert reloaded.get_hourly_counts() == chain.get_hourly_counts()
+    assert sum(reloaded.get_hourly_counts().values()) == 10
+    assert reloaded.find_vote('nic_1') == chain.find_vote('nic_1')
+    assert reloaded.leaf_hashes == chain.leaf_hashes
+    assert reloaded.get_vote_number('nic_9') == 10
+    assert reloaded.add_vote('nic_4') is False
+    assert reloaded.add_vote('nic_10') is True
+    assert reloaded.chain[4]['previous_hash'] == chain.chain[3]['hash']
+
+
+def test_snapshot_for_another_journal_is_ignored(tmp_path):
+    from utils import Blockchain
+
+    snapshot = str(tmp_path / 'vote_chain.snapshot')
+    first = Blockchain(str(tmp_path / 'first.jsonl'), snapshot_file=snapshot)
+    first.add_vote('nic_a')
+    first.write_snapshot()
+
+    second = Blockchain(str(tmp_path / 'second.jsonl'), snapshot_file=snapshot)
+    assert second.has_voted('nic_a') is False
+
+
+def test_vote_record_round_trips_current_and_legacy_votes():
+    import pickle
+    from chain_journal import VoteRecord
+
+    current = {'voter_nic': '199819800867', 'timestamp': '2025-09-05 10:10:30.401590',
+               'vote_id': 'vote_3_199819800867'}
+    whole_second = dict(current, timestamp='2025-09-05 10:10:30')
+    legacy = {'voter_nic': '199819800865', 'timestamp': '2025-09-05 22:27:26.424172',
+              'vote_id': 'vote_1_199819800868'}
+
+    for vote in (current, whole_second, legacy):
+        record = VoteRecord.from_dict(vote, 3)
+        assert record.to_dict() == vote
+        assert pickle.loads(pickle.dumps(record)).to_dict() == vote
+
+    assert VoteRecord.from_dict(current, 3).legacy is None
+    assert VoteRecord.from_dict(legacy, 3).legacy is not None
+
+
+def _write_snapshots_in_process(path, snapshot, count):
+    from utils import Blockchain
+
+    chain = Blockchain(path, block_size=3, snapshot_file=snapshot)
+    for _ in range(count):
+        chain.write_snapshot()
+
+
+def test_concurrent_snapshot_writers_do_not_share_a_temp_file(tmp_path):
+    import multiprocessing
+    import os
+    from utils import Blockchain
+
+    path = str(tmp_path / 'vote_chain.jsonl')
+    snapshot = str(tmp_path / 'vote_chain.snapshot')
+    Blockchain(path, block_size=3).add_votes([f'nic_{i}' for i in range(10)])
+
+    processes = [multiprocessing.Process(target=_write_snapshots_in_process, args=(path, snapshot, 30))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert sorted(os.listdir(tmp_path)) == ['vote_chain.jsonl', 'vote_chain.jsonl.lock', 'vote_chain.snapshot']
+    restored = Blockchain(path, block_size=3, snapshot_file=snapshot)
+    assert restored.get_vote_location('nic_9') == (4, 0)
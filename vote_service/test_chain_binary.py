@@ -0,0 +1,39 @@
+import pytest
+
+from chain_binary import BinaryChain, read_binary_chain, write_binary_chain
+from chain_journal import ChainJournal, records_to_chain
+
+
+def test_binary_export_round_trips_and_reads_by_height(tmp_path):
+    from utils import Blockchain
+
+    path = str(tmp_path / 'vote_chain.jsonl')
+    chain = Blockchain(path, block_size=4)
+    chain.add_votes([f'nic_{i}' for i in range(10)])
+    expected = records_to_chain(ChainJournal(path).replay())
+
+    binary_file = str(tmp_path / 'vote_chain.bin')
+    write_binary_chain(chain.chain, binary_file)
+
+    assert read_binary_chain(binary_file) == expected
+
+    with BinaryChain(binary_file) as binary:
+        assert len(binary) == 4
+        assert binary.block(2) == expected[2]
+        assert binary.block_header(3)['hash'] is None
+        assert binary.vote(9)['voter_nic'] == 'nic_9'
+        with pytest.raises(IndexError):
+            binary.block(4)
+
+
+def test_truncated_binary_chain_is_rejected(tmp_path):
+    binary_file = str(tmp_path / 'vote_chain.bin')
+    write_binary_chain([{'index': 0, 'timestamp': 't', 'votes': [{'voter_nic': 'a', 'timestamp': 't',
+                                                                  'vote_id': 'vote_0_a'}],
+                         'previous_hash': '0', 'merkle_root': None, 'hash': 'h'}], binary_file)
+
+    with open(binary_file, 'r+b') as f:
+        f.truncate(200)
+
+    with pytest.raises(ValueError):
+        BinaryChain(binary_file)
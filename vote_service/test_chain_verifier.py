@@ -0,0 +1,95 @@
+import json
+
+from chain_verifier import ChainVerifier
+from utils import Blockchain
+
+
+def build_chain(tmp_path, votes=50):
+    path = str(tmp_path / 'vote_chain.jsonl')
+    chain = Blockchain(path, block_size=4)
+    for i in range(votes):
+        chain.add_vote(f'nic_{i}')
+    return path
+
+
+def test_parallel_verify_and_checkpoint(tmp_path):
+    path = build_chain(tmp_path)
+    verifier = ChainVerifier(path, str(tmp_path / 'checkpoint.json'), workers=2, chunk_size=3)
+
+    report = verifier.verify()
+    assert report['valid'] is True
+    assert report['verified_from'] == 0
+    assert report['checkpoint']['height'] == 12
+
+    chain = Blockchain(path, block_size=4)
+    for i in range(50, 60):
+        chain.add_vote(f'nic_{i}')
+
+    report = verifier.verify()
+    assert report['valid'] is True
+    assert report['verified_from'] == 13
+    assert report['checkpoint']['height'] == 15
+
+
+def test_tampered_vote_reports_first_broken_block(tmp_path):
+    path = build_chain(tmp_path)
+
+    with open(path) as f:
+        lines = f.readlines()
+    for i, line in enumerate(lines):
+        record = json.loads(line)
+        if record.get('voter_nic') == 'nic_21':
+            record['voter_nic'] = 'nic_forged'
+            lines[i] = json.dumps(record) + '\n'
+    with open(path, 'w') as f:
+        f.writelines(lines)
+
+    verifier = ChainVerifier(path, str(tmp_path / 'checkpoint.json'), workers=2, chunk_size=3)
+    report = verifier.verify()
+    assert report['valid'] is False
+    assert report['first_broken'] == {'index': 6, 'reason': 'merkle_root does not match the block votes'}
+    assert report['checkpoint']['height'] == 5
+
+
+def rewrite_journal(path, edit):
+    with open(path, 'rb') as f:
+        lines = f.readlines()
+    offset = 0
+    for i, line in enumerate(lines):
+        record = json.loads(line)
+        if record.get('voter_nic') == 'nic_21':
+            lines[i:i + 1] = edit(line)
+            break
+        offset += len(line)
+    with open(path, 'wb') as f:
+        f.writelines(lines)
+    return offset
+
+
+def test_deleted_vote_is_reported_at_its_block(tmp_path):
+    path = build_chain(tmp_path)
+    rewrite_journal(path, lambda line: [])
+
+    report = ChainVerifier(path, str(tmp_path / 'checkpoint.json'), workers=1).verify()
+    assert report['valid'] is False
+    assert report['first_broken'] == {'index': 6, 'reason': 'seal records 4 votes but the journal holds 3'}
+    assert report['checkpoint']['height'] == 5
+
+
+def test_corrupt_record_is_reported_with_its_byte_offset(tmp_path):
+    path = build_chain(tmp_path)
+    offset = rewrite_journal(path, lambda line: [b'{"type": "vote", "block": 6, "vot\n'])
+
+    report = ChainVerifier(path, str(tmp_path / 'checkpoint.json'), workers=1).verify()
+    assert report['valid'] is False
+    assert report['first_broken'] == {'index': 6, 'offset': offset, 'reason': 'journal record is not valid JSON'}
+    assert report['height'] == 6
+    assert report['checkpoint']['height'] == 5
+
+    with open(path, 'rb') as f:
+        journal = f.read()
+    with open(path, 'wb') as f:
+        f.write(journal.replace(b'{"type": "vote", "block": 6, "vot\n', b'{"tpye":"vote"}\n'))
+
+    report = ChainVerifier(path, str(tmp_path / 'checkpoint.json'), workers=1).verify(full=True)
+    assert report['first_broken'] == {'index': 6, 'offset': offset, 'reason': "journal record is missing 'type'"}
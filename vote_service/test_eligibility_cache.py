@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from eligibility_cache import EligibilityCache
+
+
+class FakeListenConnection:
+    def __init__(self, payloads):
+        self.notifies = [SimpleNamespace(payload=payload) for payload in payloads]
+
+    def poll(self):
+        pass
+
+
+def build_cache(ttl=300):
+    calls = []
+    statuses = {'200012345678': True, '199912345678': False}
+
+    def load_voter_info(nic):
+        calls.append(('voter', nic))
+        if nic not in statuses:
+            return None
+        return {'nic': nic, 'full_name': 'Test Voter', 'electoral_division': 'Colombo'}
+
+    def load_auth_status(nic):
+        calls.append(('auth', nic))
+        return statuses[nic]
+
+    return EligibilityCache(load_voter_info, load_auth_status, ttl=ttl), calls, statuses
+
+
+def test_repeated_lookups_are_served_from_cache():
+    cache, calls, _ = build_cache()
+
+    assert cache.get_voter_info('200012345678')['electoral_division'] == 'Colombo'
+    assert cache.is_approved('200012345678') is True
+    assert cache.is_approved('199912345678') is False
+    assert cache.get_voter_info('200012345678')['nic'] == '200012345678'
+
+    assert calls == [('voter', '200012345678'), ('auth', '200012345678'),
+                     ('voter', '199912345678'), ('auth', '199912345678')]
+    assert cache.get_stats()['hits'] == 2
+
+    assert cache.get_voter_info('unknown') is None
+    assert cache.get_voter_info('unknown') is None
+    assert calls.count(('voter', 'unknown')) == 2
+
+
+def test_notifications_and_ttl_invalidate_entries():
+    cache, calls, statuses = build_cache()
+
+    assert cache.is_approved('199912345678') is False
+    statuses['199912345678'] = True
+    cache.handle_notifies(FakeListenConnection(['199912345678']))
+    assert cache.is_approved('199912345678') is True
+
+    cache.handle_notifies(FakeListenConnection(['']))
+    assert cache.get_stats()['entries'] == 0
+
+    expired, calls, _ = build_cache(ttl=0)
+    expired.is_approved('200012345678')
+    expired.is_approved('200012345678')
+    assert calls.count(('auth', '200012345678')) == 2
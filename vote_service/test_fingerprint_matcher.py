@@ -0,0 +1,109 @@
+import cv2
+import numpy as np
+
+from fingerprint_matcher import FingerprintVerifier, calibrate_threshold, extract_template, match_score
+
+
+def synthetic_fingerprint(seed, size=300):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32)
+    field = np.zeros_like(x)
+    for _ in range(6):
+        cx, cy = rng.uniform(0, size, 2)
+        field += np.sin(np.hypot(x - cx, y - cy) * rng.uniform(0.02, 0.06) + rng.uniform(0, 6))
+    return ((np.sin(field * 3) + 1) * 127).astype(np.uint8)
+
+
+def rescan(image, seed):
+    rng = np.random.default_rng(seed)
+    center = (image.shape[1] / 2, image.shape[0] / 2)
+    transform = cv2.getRotationMatrix2D(center, rng.uniform(-5, 5), 1.0)
+    transform[:, 2] += rng.uniform(-5, 5, 2)
+    moved = cv2.warpAffine(image, transform, image.shape[::-1], borderMode=cv2.BORDER_REFLECT)
+    return np.clip(moved + rng.normal(0, 20, image.shape), 0, 255).astype(np.uint8)
+
+
+def test_genuine_scans_score_above_impostors():
+    for seed in range(4):
+        template = extract_template(synthetic_fingerprint(seed))
+        genuine = match_score(extract_template(rescan(synthetic_fingerprint(seed), 100 + seed)), template)
+        impostor = match_score(extract_template(rescan(synthetic_fingerprint(seed + 50), 100 + seed)), template)
+        assert genuine >= 0.15 > impostor
+
+
+def test_verifier_only_loads_the_claimed_template_once():
+    loads = []
+
+    def load_template(nic):
+        loads.append(nic)
+        return extract_template(synthetic_fingerprint(1)) if nic == '200012345678' else None
+
+    verifier = FingerprintVerifier(load_template, threshold=0.15)
+    scan = rescan(synthetic_fingerprint(1), 7)
+
+    assert verifier.verify('200012345678', scan)[0] is True
+    assert verifier.verify('200012345678', rescan(synthetic_fingerprint(2), 7))[0] is False
+    assert verifier.verify('unknown', scan) == (False, 0.0)
+    assert loads == ['200012345678', 'unknown']
+
+
+def test_uncalibrated_verifier_never_matches():
+    verifier = FingerprintVerifier(lambda nic: extract_template(synthetic_fingerprint(1)))
+    assert verifier.verify('200012345678', rescan(synthetic_fingerprint(1), 7)) == (False, 0.0)
+
+
+def test_calibrated_threshold_separates_genuine_from_impostor_pairs():
+    nics, templates = [], []
+    for seed in range(4):
+        for scan in range(2):
+            nics.append(f'nic_{seed}')
+            templates.append(extract_template(rescan(synthetic_fingerprint(seed), 10 * seed + scan)))
+
+    report = calibrate_threshold(nics, templates)
+    assert report['impostor_pairs'] == 24 and report['genuine_pairs'] == 4
+    assert report['false_accept_rate'] == 0.0
+    assert report['false_reject_rate'] == 0.0
+
+
+def test_templates_enrolled_at_registration_are_read_from_the_store(tmp_path):
+    from common.fingerprint_templates import TemplateStore, TemplateStoreWriter
+
+    store_file = str(tmp_path / 'fingerprint_templates.bin')
+    image_file = str(tmp_path / 'fingerprint.png')
+    cv2.imwrite(image_file, synthetic_fingerprint(3))
+
+    writer = TemplateStoreWriter(store_file)
+    assert writer.enroll('200012345678', image_file)
+
+    store = TemplateStore(store_file)
+    assert len(store) == 1
+    assert store.get('199900000000') is None
+
+    writer.append('199900000000', extract_template(synthetic_fingerprint(4)))
+    points, descriptors = store.get('199900000000')
+    assert len(store) == 2
+    assert descriptors.dtype == np.uint8 and points.shape == (len(descriptors), 2)
+
+    template = store.get('200012345678')
+    assert match_score(extract_template(rescan(synthetic_fingerprint(3), 9)), template) >= 0.15
+    assert match_score(extract_template(rescan(synthetic_fingerprint(5), 9)), template) < 0.15
+
+
+def test_store_follows_a_rebuilt_file(tmp_path):
+    import os
+    from common.fingerprint_templates import TemplateStore, TemplateStoreWriter
+
+    store_file = str(tmp_path / 'fingerprint_templates.bin')
+    writer = TemplateStoreWriter(store_file)
+    writer.append('200012345678', extract_template(synthetic_fingerprint(6)))
+    store = TemplateStore(store_file)
+
+    rebuilt = TemplateStoreWriter(store_file + '.rebuild')
+    rebuilt.append('199900000000', extract_template(synthetic_fingerprint(7)))
+    with writer.lock:
+        os.replace(store_file + '.rebuild', store_file)
+
+    template = store.get('199900000000')
+    assert match_score(extract_template(rescan(synthetic_fingerprint(7), 11)), template) >= 0.15
+    assert store.get('200012345678') is None
+    assert len(store) == 1
@@ -0,0 +1,84 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from frame_relay import FrameRelay
+
+
+class FakeSession:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, data, headers, timeout):
+        self.posts.append((url, data, headers['Content-Type']))
+        return SimpleNamespace(status_code=200, json=lambda: {'success': True, 'is_fraud': False,
+                                                              'person_count': 1})
+
+
+def test_only_the_newest_frame_per_voter_is_relayed():
+    session = FakeSession()
+    relay = FrameRelay('http://fraud', session=session)
+    relay.is_running = True
+
+    assert relay.submit('nic_1', b'frame-1') is None
+    relay.submit('nic_1', b'frame-2')
+    relay.submit('nic_2', b'frame-a')
+    relay.submit('nic_1', b'frame-3')
+
+    frames = relay.pending
+    relay.pending = {}
+    for voter_nic, jpeg_bytes in frames.items():
+        relay.send(voter_nic, jpeg_bytes)
+
+    assert session.posts == [('http://fraud/api/stream_frame/nic_1', b'frame-3', 'image/jpeg'),
+                             ('http://fraud/api/stream_frame/nic_2', b'frame-a', 'image/jpeg')]
+    assert relay.submit('nic_1', b'frame-4')['person_count'] == 1
+
+    stats = relay.get_stats()
+    assert stats['frames_received'] == 5
+    assert stats['frames_dropped'] == 2
+    assert stats['frames_sent'] == 2
+
+    relay.forget('nic_1')
+    assert relay.submit('nic_1', b'frame-5') is None
+
+
+def test_a_slow_booth_does_not_hold_up_the_others():
+    class SlowSession(FakeSession):
+        def __init__(self):
+            super().__init__()
+            self.release = threading.Event()
+            self.in_flight = set()
+            self.overlapped = False
+
+        def post(self, url, data, headers, timeout):
+            voter_nic = url.rsplit('/', 1)[-1]
+            if voter_nic in self.in_flight:
+                self.overlapped = True
+            self.in_flight.add(voter_nic)
+            if voter_nic == 'nic_slow':
+                self.release.wait(5)
+            self.in_flight.discard(voter_nic)
+            return super().post(url, data, headers, timeout)
+
+    session = SlowSession()
+    relay = FrameRelay('http://fraud', workers=2, session=session)
+
+    relay.submit('nic_slow', b'frame-1')
+    time.sleep(0.05)
+    relay.submit('nic_slow', b'frame-2')
+    relay.submit('nic_fast', b'frame-a')
+
+    deadline = time.monotonic() + 1
+    while relay.get_stats()['frames_sent'] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert session.posts == [('http://fraud/api/stream_frame/nic_fast', b'frame-a', 'image/jpeg')]
+
+    session.release.set()
+    deadline = time.monotonic() + 2
+    while relay.get_stats()['frames_sent'] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    relay.stop()
+
+    assert [data for url, data, _ in session.posts if url.endswith('nic_slow')] == [b'frame-1', b'frame-2']
+    assert not session.overlapped
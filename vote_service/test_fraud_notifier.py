@@ -0,0 +1,91 @@
+import time
+from types import SimpleNamespace
+
+import requests
+
+from fraud_notifier import FraudNotifier
+
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.posts = []
+
+    def post(self, url, json, timeout):
+        self.posts.append((url, json['voter_nic']))
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(status_code=outcome)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_delivery_retries_with_backoff_until_success():
+    session = FakeSession([requests.exceptions.ConnectionError('down'), 503, 200])
+    notifier = FraudNotifier('http://fraud', backoff=0.001, session=session)
+
+    assert notifier.deliver('nic_1', 'start_monitoring') is None
+    assert notifier.deliver('nic_1', 'start_monitoring', 1) is None
+    assert notifier.deliver('nic_1', 'start_monitoring', 2) is True
+    assert session.posts == [('http://fraud/api/start_monitoring', 'nic_1')] * 3
+
+    notifier = FraudNotifier('http://fraud', max_retries=1, backoff=0.001,
+                             session=FakeSession([requests.exceptions.ConnectionError('down'), 503, 200]))
+    notifier.notify('nic_1', 'start_monitoring')
+    assert wait_for(lambda: notifier.get_stats()['failed'] == 1)
+    notifier.notify('nic_2', 'start_monitoring')
+    assert wait_for(lambda: notifier.get_stats()['delivered'] == 1)
+    notifier.stop()
+
+    stats = notifier.get_stats()
+    assert stats['retried'] == 1
+    assert stats['retries_waiting'] == 0
+
+
+def test_a_failing_notification_does_not_hold_up_other_booths():
+    class FlakySession(FakeSession):
+        def post(self, url, json, timeout):
+            self.posts.append((url, json['voter_nic']))
+            if json['voter_nic'] == 'nic_bad' and len(self.posts) < 4:
+                raise requests.exceptions.ConnectionError('down')
+            return SimpleNamespace(status_code=200)
+
+    session = FlakySession([])
+    notifier = FraudNotifier('http://fraud', backoff=0.3, session=session)
+
+    notifier.notify('nic_bad', 'start_monitoring')
+    notifier.notify('nic_good', 'start_monitoring')
+    notifier.notify('nic_bad', 'stop_monitoring')
+    assert wait_for(lambda: ('http://fraud/api/start_monitoring', 'nic_good') in session.posts, timeout=0.25)
+    assert wait_for(lambda: notifier.get_stats()['delivered'] == 3)
+    notifier.stop()
+
+    bad = [url for url, nic in session.posts if nic == 'nic_bad']
+    assert bad[-2:] == ['http://fraud/api/start_monitoring', 'http://fraud/api/stop_monitoring']
+
+
+def test_notify_returns_immediately_and_drops_when_full():
+    session = FakeSession([])
+    notifier = FraudNotifier('http://fraud', max_queue=2, session=session)
+
+    notifier.is_running = True
+    assert notifier.notify('nic_1', 'start_monitoring') is True
+    assert notifier.notify('nic_1', 'stop_monitoring') is True
+    assert notifier.notify('nic_2', 'start_monitoring') is False
+    assert notifier.get_stats()['dropped'] == 1
+
+    notifier.is_running = False
+    notifier.start()
+    deadline = time.monotonic() + 5
+    while notifier.get_stats()['delivered'] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    notifier.stop()
+
+    assert session.posts == [('http://fraud/api/start_monitoring', 'nic_1'),
+                             ('http://fraud/api/stop_monitoring', 'nic_1')]
@@ -0,0 +1,129 @@
+import threading
+
+from chain_verifier import shard_targets, verify_shards
+from sharded_chain import ShardedChain, LEGACY_SHARD
+
+
+def build_sharded_chain(tmp_path, legacy_chain=None):
+    from utils import Blockchain
+
+    return ShardedChain(str(tmp_path / 'shards'), str(tmp_path / 'anchor_chain.jsonl'),
+                        lambda shard_file: Blockchain(shard_file, block_size=4), legacy_chain)
+
+
+def test_divisions_append_in_parallel_and_are_anchored(tmp_path):
+    chain = build_sharded_chain(tmp_path)
+    divisions = ['Colombo', 'Kandy', 'Nuwara Eliya']
+
+    def cast(division):
+        shard = chain.get_shard(division)
+        shard.add_votes([f'{division}_{i}' for i in range(10)])
+
+    threads = [threading.Thread(target=cast, args=(division,)) for division in divisions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert chain.get_vote_count() == 30
+    assert chain.has_voted('Kandy_3')
+    assert not chain.has_voted('Galle_3')
+    assert chain.get_vote_location('Nuwara Eliya_5') == ('Nuwara Eliya', 2, 1)
+
+    anchor = chain.anchor()
+    assert set(anchor['heads']) == set(divisions)
+    assert anchor['heads']['Kandy'] == {'height': 2, 'hash': chain.get_shard('Kandy').chain[2]['hash']}
+    assert chain.anchor() is None
+    assert chain.verify_anchors() is None
+
+    reopened = build_sharded_chain(tmp_path)
+    assert set(reopened.shards) == set(divisions)
+    assert reopened.has_voted('Colombo_9')
+    assert reopened.anchor_chain.latest()['hash'] == anchor['hash']
+
+    reports = verify_shards(shard_targets(str(tmp_path / 'shards')), workers=1)
+    assert set(reports) == set(divisions)
+    assert all(report['valid'] for report in reports.values())
+
+
+def test_legacy_chain_is_checked_but_not_written(tmp_path):
+    from utils import Blockchain
+
+    legacy_chain = Blockchain(str(tmp_path / 'vote_chain.jsonl'), block_size=4)
+    legacy_chain.add_votes(['nic_1', 'nic_2'])
+
+    chain = build_sharded_chain(tmp_path, legacy_chain)
+    assert chain.has_voted('nic_1')
+    assert chain.get_vote_location('nic_2') == (LEGACY_SHARD, 1, 1)
+
+    chain.get_shard('Galle').add_vote('nic_3')
+    assert chain.get_division_counts() == {LEGACY_SHARD: 2, 'Galle': 1}
+    assert sum(chain.get_hourly_counts().values()) == 3
+
+    chain.anchor()
+    chain.get_shard('Galle').chain[0]['hash'] = 'tampered'
+    assert chain.verify_anchors() is not None
+
+
+def test_receipt_proves_inclusion_in_sealed_block(tmp_path):
+    from merkle import hash_leaf, verify_inclusion
+    from utils import Blockchain
+
+    chain = build_sharded_chain(tmp_path)
+    chain.get_shard('Matara').add_votes([f'nic_{i}' for i in range(6)])
+
+    leaf_hash = hash_leaf(chain.find_vote('nic_2'))
+    receipt = chain.get_receipt(leaf_hash)
+    assert 'nic_2' not in str(receipt)
+    assert receipt['division'] == 'Matara'
+    assert receipt['sealed'] is True
+    assert verify_inclusion(receipt['leaf_hash'], receipt['leaf_index'], receipt['tree_size'],
+                            receipt['proof'], receipt['merkle_root'])
+    assert receipt['block_hash'] == Blockchain.calculate_hash(receipt['block_index'], receipt['previous_hash'],
+                                                              receipt['merkle_root'], receipt['block_timestamp'])
+
+    pending = chain.get_receipt(hash_leaf(chain.find_vote('nic_5')))
+    assert pending['sealed'] is False and pending['proof'] is None
+
+    assert chain.get_receipt('0' * 64) is None
+
+    auditor = build_sharded_chain(tmp_path)
+    assert auditor.get_receipt(leaf_hash)['proof'] == receipt['proof']
+
+
+def test_lookups_go_straight_to_the_voters_division(tmp_path):
+    from utils import Blockchain
+
+    divisions = {f'nic_{i}': ['Colombo', 'Kandy', 'Galle'][i % 3] for i in range(9)}
+    chain = ShardedChain(str(tmp_path / 'shards'), str(tmp_path / 'anchor_chain.jsonl'),
+                         lambda shard_file: Blockchain(shard_file, block_size=4), division_of=divisions.get)
+    for nic, division in divisions.items():
+        if nic != 'nic_7':
+            chain.get_shard(division).add_vote(nic)
+
+    def untouched(voter_nic):
+        raise AssertionError('looked up a shard outside the voter division')
+
+    chain.get_shard('Colombo').has_voted = untouched
+    chain.get_shard('Galle').has_voted = untouched
+    assert chain.get_vote_location('nic_4') == ('Kandy', 1, 1)
+    assert not chain.has_voted('nic_7')
+
+    reopened = ShardedChain(str(tmp_path / 'shards'), str(tmp_path / 'anchor_chain.jsonl'),
+                            lambda shard_file: Blockchain(shard_file, block_size=4), division_of=divisions.get)
+    assert reopened.has_voted('nic_5')
+    assert not reopened.has_voted('unregistered')
+
+
+def test_counts_include_votes_appended_by_other_workers(tmp_path):
+    first = build_sharded_chain(tmp_path)
+    second = build_sharded_chain(tmp_path)
+
+    first.get_shard('Kandy').add_votes(['nic_1', 'nic_2'])
+    assert second.get_division_counts() == {'Kandy': 2}
+
+    first.get_shard('Kandy').add_votes(['nic_3', 'nic_4', 'nic_5'])
+    first.get_shard('Galle').add_vote('nic_6')
+    assert second.get_division_counts() == first.get_division_counts() == {'Kandy': 5, 'Galle': 1}
+    assert second.get_vote_count() == 6
+    assert sum(second.get_hourly_counts().values()) == 6
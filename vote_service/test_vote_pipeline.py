@@ -0,0 +1,83 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from vote_pipeline import GroupCommitWriter, PendingVote
+
+
+def test_concurrent_votes_are_group_committed(tmp_path):
+    from utils import Blockchain
+
+    blockchain = Blockchain(str(tmp_path / 'vote_chain.jsonl'))
+    writer = GroupCommitWriter(blockchain, MagicMock(), max_batch=16, max_latency=0.05)
+    stored = []
+    writer.store_votes = lambda accepted: stored.append(len(accepted)) or True
+
+    results = {}
+
+    def cast(nic):
+        results[nic] = writer.submit(nic, '1')
+
+    threads = [threading.Thread(target=cast, args=(f'nic_{i}',)) for i in range(24)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(success for success, _ in results.values())
+    assert sum(stored) == 24
+    assert len(stored) < 24
+
+    stats = writer.get_stats()
+    assert stats['votes_committed'] == 24
+    assert stats['largest_batch'] <= 16
+
+    assert writer.submit('nic_3', '2') == (False, "Voter has already voted")
+    writer.stop()
+
+
+def test_failed_store_is_reported_to_every_voter(tmp_path):
+    from utils import Blockchain
+
+    blockchain = Blockchain(str(tmp_path / 'vote_chain.jsonl'))
+    writer = GroupCommitWriter(blockchain, MagicMock())
+    writer.store_votes = lambda accepted: False
+
+    assert writer.submit('nic_a', '1') == (False, "Failed to store vote")
+    assert writer.get_stats()['votes_failed'] == 1
+    writer.stop()
+
+
+def test_votes_and_sessions_are_stored_in_one_statement(tmp_path):
+    from utils import Blockchain
+
+    blockchain = Blockchain(str(tmp_path / 'vote_chain.jsonl'))
+    vote_pool = MagicMock()
+    writer = GroupCommitWriter(blockchain, vote_pool, shard='Colombo')
+    blockchain.add_votes(['nic_a', 'nic_b'])
+
+    with patch('vote_pipeline.execute_values') as execute_values:
+        assert writer.store_votes([PendingVote('nic_a', '1'), PendingVote('nic_b', '2')])
+
+    execute_values.assert_called_once()
+    sql, rows = execute_values.call_args.args[1:3]
+    assert 'ON CONFLICT (voter_nic)' in sql
+    assert rows == [('nic_a', '1', 'Colombo', None, 1, 0), ('nic_b', '2', 'Colombo', None, 1, 1)]
+    vote_pool.getconn.return_value.commit.assert_called_once()
+
+
+def test_blocks_sealed_before_the_insert_commits_are_backfilled(tmp_path):
+    from utils import Blockchain
+
+    blockchain = Blockchain(str(tmp_path / 'vote_chain.jsonl'))
+    vote_pool = MagicMock()
+    vote_pool.getconn.return_value.commit.side_effect = lambda: blockchain.seal_block()
+    writer = GroupCommitWriter(blockchain, vote_pool, shard='Colombo')
+    blockchain.add_votes(['nic_a', 'nic_b'])
+    sealed = []
+    blockchain.seal_listeners.append(sealed.append)
+
+    with patch('vote_pipeline.execute_values'):
+        assert writer.store_votes([PendingVote('nic_a', '1'), PendingVote('nic_b', '2')])
+
+    assert [block['index'] for block in sealed] == [1, 1]
+    assert sealed[-1]['hash'] == blockchain.chain[1]['hash']
@@ -17,13 +17,20 @@ def client():
         with app.app_context():
             yield client
 
+
+@patch('routes.vote_manager.get_vote_writer')
+@patch('routes.vote_manager.get_voter_info')
 @patch('routes.vote_manager.blockchain.has_voted')
 @patch('routes.vote_manager.check_voter_auth_status')
 @patch('routes.notify_fraud_service')
-def test_cast_vote_integration(mock_notify_fraud, mock_check_auth, mock_has_voted, client):
+def test_cast_vote_integration(mock_notify_fraud, mock_check_auth, mock_has_voted, mock_get_voter_info,
+                               mock_get_vote_writer, client):
     mock_has_voted.return_value = False
     mock_check_auth.return_value = True
     mock_notify_fraud.return_value = True
+    mock_get_voter_info.return_value = {'nic': 'test_nic_123', 'full_name': 'Test Voter',
+                                        'electoral_division': 'Colombo'}
+    mock_get_vote_writer.return_value.submit.return_value = (True, 'Vote recorded')
 
     with client.session_transaction() as sess:
         sess['voter_nic'] = 'test_nic_123'
@@ -32,4 +39,82 @@ def test_cast_vote_integration(mock_notify_fraud, mock_check_auth, mock_has_vote
     response = client.post('/api/cast', json=data)
 
     assert response.status_code == 200
-    assert response.json['success'] is True
\ No newline at end of file
+    assert response.json['success'] is True
+    mock_get_vote_writer.assert_called_once_with('Colombo')
+    mock_get_vote_writer.return_value.submit.assert_called_once_with('test_nic_123', '1')
+
+
+def fingerprint_image():
+    import base64
+    import cv2
+    import numpy as np
+
+    _, jpeg = cv2.imencode('.jpg', np.zeros((32, 32), dtype=np.uint8))
+    return 'data:image/jpeg;base64,' + base64.b64encode(jpeg.tobytes()).decode()
+
+
+@patch('routes.vote_manager.get_voter_info')
+@patch('routes.vote_manager.validate_officer_id')
+def test_claiming_an_identity_does_not_authorise_a_vote(mock_validate_officer, mock_get_voter_info, client):
+    mock_validate_officer.return_value = True
+    mock_get_voter_info.return_value = {'nic': 'test_nic_123', 'full_name': 'Test Voter',
+                                        'electoral_division': 'Colombo'}
+
+    with client.session_transaction() as sess:
+        sess['voter_nic'] = 'test_nic_456'
+
+    response = client.post('/api/claim_identity', json={'officer_id': 'officer_1', 'voter_nic': 'test_nic_123'})
+    assert response.json['success'] is True
+
+    with client.session_transaction() as sess:
+        assert sess['claimed_nic'] == 'test_nic_123'
+        assert 'voter_nic' not in sess
+
+
+@patch('routes.vote_manager.check_voter_auth_status')
+@patch('routes.vote_manager.blockchain.has_voted')
+@patch('routes.vote_manager.get_voter_info')
+@patch('routes.fingerprint_verifier.verify')
+@patch('routes.fingerprint_verifier.threshold', 0.2)
+@patch('routes.fingerprint_recognizer.recognize_fingerprint')
+@patch('routes.notify_fraud_service')
+def test_fingerprint_verification_checks_only_the_claimed_nic(mock_notify_fraud, mock_recognize, mock_verify,
+                                                              mock_get_voter_info, mock_has_voted, mock_check_auth,
+                                                              client):
+    mock_verify.return_value = (False, 0.05)
+    mock_get_voter_info.return_value = {'nic': 'test_nic_123', 'full_name': 'Test Voter',
+                                        'electoral_division': 'Colombo'}
+    mock_has_voted.return_value = False
+    mock_check_auth.return_value = True
+
+    with client.session_transaction() as sess:
+        sess['claimed_nic'] = 'test_nic_123'
+
+    response = client.post('/api/process_fingerprint', json={'image': fingerprint_image()})
+    assert response.json['mode'] == 'verify'
+    assert response.json['authenticated'] is False
+    with client.session_transaction() as sess:
+        assert 'voter_nic' not in sess
+
+    mock_verify.return_value = (True, 0.4)
+    response = client.post('/api/process_fingerprint', json={'image': fingerprint_image()})
+    assert response.json['authenticated'] is True
+    assert mock_verify.call_args[0][0] == 'test_nic_123'
+    mock_recognize.assert_not_called()
+    with client.session_transaction() as sess:
+        assert sess['voter_nic'] == 'test_nic_123'
+        assert 'claimed_nic' not in sess
+
+
+def test_receipt_is_looked_up_by_leaf_hash(client):
+    leaf_hash = 'ab' * 32
+    with patch('routes.vote_manager.blockchain.get_receipt') as mock_get_receipt:
+        mock_get_receipt.return_value = None
+        response = client.get(f'/api/receipt/{leaf_hash}')
+        assert response.status_code == 404
+
+        mock_get_receipt.return_value = {'leaf_hash': leaf_hash, 'sealed': False}
+        response = client.get(f'/api/receipt/{leaf_hash}')
+        assert response.status_code == 200
+
+    mock_get_receipt.assert_called_with(leaf_hash)
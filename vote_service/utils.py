@@ -3,23 +3,89 @@ import numpy as np
 import pickle
 import json
 import hashlib
-import tensorflow as tf
 import os
+import sys
+import time
+import threading
 from datetime import datetime
 import psycopg2
 from config import config
+from chain_journal import ChainJournal, JournalVotes, VoteRecord, open_block, vote_record, seal_record, chain_to_records, \
+    chain_json_default, replace_file
+from merkle import IncrementalMerkleTree, EMPTY_ROOT, hash_leaf, inclusion_proof
+from vote_pipeline import GroupCommitWriter
+from sharded_chain import ShardedChain, LEGACY_SHARD
+from eligibility_cache import EligibilityCache
+from fingerprint_matcher import TemplateStore, extract_template
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.inference_batcher import InferenceBatcher
+
+
+SNAPSHOT_VERSION = 3
 
 
 class FingerprintRecognizer:
-    def __init__(self, model_path):
+    def __init__(self, model_path, max_batch=32, max_latency=0.004, background=True):
         self.model = None
         self.label_encoder = None
         self.input_shape = None
+        self.batcher = InferenceBatcher(self.predict_batch, max_batch, max_latency)
+        self.ready = threading.Event()
+        self.status = 'loading'
+        self.load_seconds = None
+        self.warmup_seconds = None
+
+        if background:
+            warmup_thread = threading.Thread(target=self.warm_up, args=(model_path,))
+            warmup_thread.daemon = True
+            warmup_thread.start()
+        else:
+            self.warm_up(model_path)
+
+    def warm_up(self, model_path):
+        
+        started = time.monotonic()
         self.load_model(model_path)
+        self.load_seconds = time.monotonic() - started
+        if self.model is None:
+            self.status = 'failed'
+            return
+
+        self.status = 'warming'
+        started = time.monotonic()
+        try:
+            dummy = np.zeros((self.batcher.max_batch, self.input_shape[0], self.input_shape[1], 1), dtype=np.float32)
+            for batch_size in sorted({1, self.batcher.max_batch}):
+                self.predict_batch(dummy[:batch_size])
+        except Exception as e:
+            print(f"Fingerprint model warm-up failed: {e}")
+            self.status = 'failed'
+            return
+
+        self.warmup_seconds = time.monotonic() - started
+        self.status = 'ready'
+        self.ready.set()
+        print(f"Fingerprint model ready (load {self.load_seconds:.1f}s, warm-up {self.warmup_seconds:.1f}s)")
+
+    def is_ready(self):
+        
+        return self.ready.is_set()
+
+    def get_readiness(self):
+        
+        return {
+            'ready': self.is_ready(),
+            'status': self.status,
+            'load_seconds': self.load_seconds,
+            'warmup_seconds': self.warmup_seconds
+        }
 
     def load_model(self, model_path):
         
         try:
+            import tensorflow as tf
+
             
             self.model = tf.keras.models.load_model(model_path.replace('.pkl', '.h5'))
 
@@ -66,113 +132,443 @@ class FingerprintRecognizer:
             processed_image = self.extract_fingerprint_features_cnn(image)
 
             
-            processed_image = np.expand_dims(processed_image, axis=0)
-
-            
-            predictions = self.model.predict(processed_image, verbose=0)
+            predictions = self.batcher.submit(processed_image.astype(np.float32))
             confidence = np.max(predictions)
-            predicted_class = np.argmax(predictions, axis=1)
+            predicted_class = np.argmax(predictions)
 
             if confidence < 0.6:  
                 return None, confidence
 
-            predicted_nic = self.label_encoder.inverse_transform(predicted_class)[0]
+            predicted_nic = self.label_encoder.inverse_transform([predicted_class])[0]
             return predicted_nic, confidence
 
         except Exception as e:
             print(f"Fingerprint recognition error: {e}")
             return None, 0.0
 
+    def predict_batch(self, images):
+        
+        return np.asarray(self.model.predict_on_batch(images))
+
+    def get_inference_stats(self):
+        
+        return self.batcher.get_stats()
+
 
 class Blockchain:
-    def __init__(self, blockchain_file):
+    def __init__(self, blockchain_file, legacy_file=None, block_size=10, seal_interval=None,
+                 snapshot_file=None, snapshot_interval=500):
         self.blockchain_file = blockchain_file
-        self.chain = self.load_chain()
+        self.legacy_file = legacy_file
+        self.block_size = block_size
+        self.seal_interval = seal_interval
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self.journal = ChainJournal(blockchain_file)
+        self.lock = threading.RLock()
+        self.seal_listeners = []
+        with self.lock, self.journal.lock:
+            self.load_chain()
+
+    def reset_state(self):
+        
+        self.chain = []
+        self.voter_index = {}
+        self.leaf_hashes = {}
+        self.hourly_counts = {}
+        self.block_offsets = []
+        self.block_journal_offsets = []
+        self.open_tree = IncrementalMerkleTree()
+        self.open_block_started = time.monotonic()
+        self.pending_bytes = 0
+        self.sealed_since_snapshot = 0
+        self.journal.offset = 0
 
     def load_chain(self):
         
-        try:
-            with open(self.blockchain_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            
-            return [self.create_genesis_block()]
+        self.reset_state()
+
+        if not self.journal.exists():
+            if self.legacy_file and os.path.exists(self.legacy_file):
+                with open(self.legacy_file, 'r') as f:
+                    self.journal.rewrite(chain_to_records(json.load(f)))
+                print(f"Converted {self.legacy_file} to journal {self.blockchain_file}")
+            else:
+                self.create_genesis_block()
+            self.journal.offset = 0
+
+        if self.load_snapshot():
+            print(f"Loaded chain snapshot at height {len(self.chain) - 1}")
+
+        self._sync()
+        return self.chain
 
     def create_genesis_block(self):
         
-        genesis_block = {
-            'index': 0,
-            'timestamp': str(datetime.now()),
-            'votes': [],
-            'previous_hash': '0',
-            'hash': self.calculate_hash(0, '0', [], str(datetime.now()))
-        }
-        self.save_chain([genesis_block])
+        genesis_block = open_block(0, '0', str(datetime.now()))
+        genesis_block['merkle_root'] = EMPTY_ROOT
+        genesis_block['hash'] = self.calculate_hash(0, '0', EMPTY_ROOT, genesis_block['timestamp'])
+        self.journal.append(seal_record(genesis_block))
         return genesis_block
 
-    def calculate_hash(self, index, previous_hash, votes, timestamp):
+    def load_snapshot(self):
+        
+        if not self.snapshot_file:
+            return False
+
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Ignoring unreadable chain snapshot: {e}")
+            return False
+
+        if snapshot.get('version') != SNAPSHOT_VERSION \
+                or snapshot['journal_offset'] > self.journal.size() \
+                or snapshot['journal_head'] != hashlib.sha256(self.journal.read_first_line()).hexdigest():
+            print("Chain snapshot does not match the journal, replaying the full journal")
+            return False
+
+        for index, timestamp, previous_hash, merkle_root, block_hash, vote_count, offset in snapshot['blocks']:
+            self.chain.append({
+                'index': index,
+                'timestamp': timestamp,
+                'votes': JournalVotes(self.journal, offset, vote_count),
+                'previous_hash': previous_hash,
+                'merkle_root': merkle_root,
+                'hash': block_hash
+            })
+            self.block_journal_offsets.append(offset)
+
+        if snapshot['open_block']:
+            self.chain.append(snapshot['open_block'])
+            self.block_journal_offsets.append(snapshot['open_block_offset'])
+            open_votes = snapshot['open_block']['votes']
+            self.open_tree = IncrementalMerkleTree(hash_leaf(vote.to_dict()) for vote in open_votes)
+
+        self.voter_index = snapshot['voter_index']
+        self.leaf_hashes = snapshot['leaf_hashes']
+        self.hourly_counts = snapshot['hourly_counts']
+        self.block_offsets = snapshot['block_offsets']
+        self.journal.offset = snapshot['journal_offset']
+        return True
+
+    def write_snapshot(self):
+        
+        if not self.snapshot_file:
+            return None
+
+        with self.lock:
+            sealed_count = len(self.chain) if self.chain[-1]['hash'] is not None else len(self.chain) - 1
+            blocks = [
+                (block['index'], block['timestamp'], block['previous_hash'], block.get('merkle_root'),
+                 block['hash'], len(block['votes']), self.block_journal_offsets[block['index']])
+                for block in self.chain[:sealed_count]
+            ]
+            open_tail = None
+            if sealed_count < len(self.chain):
+                open_tail = dict(self.chain[-1], votes=list(self.chain[-1]['votes']))
+
+            snapshot = {
+                'version': SNAPSHOT_VERSION,
+                'journal_offset': self.journal.offset,
+                'journal_head': hashlib.sha256(self.journal.read_first_line()).hexdigest(),
+                'height': len(self.chain) - 1,
+                'tail_hash': self.chain[sealed_count - 1]['hash'],
+                'blocks': blocks,
+                'open_block': open_tail,
+                'open_block_offset': self.block_journal_offsets[-1] if open_tail else None,
+                'voter_index': dict(self.voter_index),
+                'leaf_hashes': dict(self.leaf_hashes),
+                'hourly_counts': dict(self.hourly_counts),
+                'block_offsets': list(self.block_offsets)
+            }
+            self.sealed_since_snapshot = 0
+
+        replace_file(self.snapshot_file, lambda f: pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL))
+        return snapshot['height']
+
+    @staticmethod
+    def calculate_hash(index, previous_hash, merkle_root, timestamp):
+        
+        block_string = f"{index}{previous_hash}{merkle_root}{timestamp}"
+        return hashlib.sha256(block_string.encode()).hexdigest()
+
+    @staticmethod
+    def calculate_legacy_hash(index, previous_hash, votes, timestamp):
         
         block_string = f"{index}{previous_hash}{json.dumps(votes)}{timestamp}"
         return hashlib.sha256(block_string.encode()).hexdigest()
 
+    def is_sealed(self, block_index):
+        
+        return self.chain[block_index]['hash'] is not None
+
+    def refresh(self):
+        
+        if not self.journal.has_new_data():
+            return
+        with self.lock:
+            for offset, record in self.journal.read_entries():
+                self._apply_record(record, offset)
+
     def add_vote(self, voter_nic):
         
+        return self.add_votes([voter_nic])[0]
+
+    def add_votes(self, voter_nics):
+        
+        records = []
+        sealed_blocks = []
+        results = []
+
+        with self.lock, self.journal.lock:
+            self._sync()
+
+            sealed = self._seal_if_due(records)
+            if sealed:
+                sealed_blocks.append(sealed)
+
+            for voter_nic in voter_nics:
+                if voter_nic in self.voter_index:
+                    results.append(False)
+                    continue
+                sealed = self._append_vote(voter_nic, records)
+                if sealed:
+                    sealed_blocks.append(sealed)
+                results.append(True)
+
+            self._commit(records)
+
+        self._notify_sealed(sealed_blocks)
+        return results
+
+    def seal_if_due(self):
+        
+        records = []
+        with self.lock, self.journal.lock:
+            self._sync()
+            sealed = self._seal_if_due(records)
+            self._commit(records)
+
+        if sealed:
+            self._notify_sealed([sealed])
+        return sealed
+
+    def seal_block(self):
+        
+        records = []
+        with self.lock, self.journal.lock:
+            self._sync()
+            sealed = self._seal_open_block(records)
+            self._commit(records)
+
+        if sealed:
+            self._notify_sealed([sealed])
+        return sealed
+
+    def _sync(self):
+        
+        for offset, record in self.journal.read_entries(truncate_torn_tail=True):
+            self._apply_record(record, offset)
+
+    def _apply_record(self, record, offset):
+        
+        if record['type'] == 'vote':
+            if record['block'] >= len(self.chain):
+                self._open_block(record['block'], record['timestamp'], offset)
+
+            block = self.chain[record['block']]
+            vote_data = {
+                'voter_nic': record['voter_nic'],
+                'timestamp': record['timestamp'],
+                'vote_id': record['vote_id']
+            }
+            vote = VoteRecord.from_dict(vote_data, block['index'])
+            block['votes'].append(vote)
+            leaf_hash = hash_leaf(vote_data)
+            leaf_index = self.open_tree.append(leaf_hash)
+            self.voter_index.setdefault(vote.voter_nic, (block['index'], leaf_index))
+            self.leaf_hashes.setdefault(leaf_hash, (block['index'], leaf_index))
+            hour = f"{record['timestamp'][:13]}:00"
+            self.hourly_counts[hour] = self.hourly_counts.get(hour, 0) + 1
+            if 'hash' in record:
+                block['hash'] = record['hash']
+
+        elif record['type'] == 'seal':
+            if record['index'] >= len(self.chain):
+                self._open_block(record['index'], record['timestamp'], offset)
+
+            block = self.chain[record['index']]
+            block['timestamp'] = record['timestamp']
+            block['previous_hash'] = record['previous_hash']
+            block['merkle_root'] = record['merkle_root']
+            block['hash'] = record['hash']
+            self.open_tree = IncrementalMerkleTree()
+
+        elif record['type'] == 'block':
+            self._open_block(record['index'], record['timestamp'], offset)
+            self.chain[-1]['previous_hash'] = record['previous_hash']
+            self.chain[-1]['hash'] = record['hash']
+
+    def _open_block(self, index, timestamp, offset):
+        
+        previous_hash = self.chain[-1]['hash'] if self.chain else '0'
+        self.block_offsets.append(self.get_vote_count())
+        self.block_journal_offsets.append(offset)
+        self.chain.append(open_block(index, previous_hash, timestamp))
+        self.open_tree = IncrementalMerkleTree()
+        self.open_block_started = time.monotonic()
+
+    def _stage(self, record, records):
         
-        for block in self.chain:
-            for vote in block['votes']:
-                if vote['voter_nic'] == voter_nic:
-                    return False
+        line = self.journal.encode(record)
+        self._apply_record(record, self.journal.offset + self.pending_bytes)
+        self.pending_bytes += len(line)
+        records.append(line)
 
+    def _append_vote(self, voter_nic, records):
         
-        vote_data = {
+        block_index = len(self.chain) if self.chain[-1]['hash'] is not None else len(self.chain) - 1
+        record = vote_record({'index': block_index}, {
             'voter_nic': voter_nic,
             'timestamp': str(datetime.now()),
-            'vote_id': f"vote_{len(self.chain)}_{voter_nic}"
-        }
+            'vote_id': f"vote_{block_index}_{voter_nic}"
+        })
+        self._stage(record, records)
 
+        if len(self.chain[-1]['votes']) >= self.block_size:
+            return self._seal_open_block(records)
+        return None
+
+    def _seal_if_due(self, records):
         
-        if len(self.chain[-1]['votes']) >= 10:  
-            new_block = {
-                'index': len(self.chain),
-                'timestamp': str(datetime.now()),
-                'votes': [vote_data],
-                'previous_hash': self.chain[-1]['hash'],
-                'hash': self.calculate_hash(len(self.chain), self.chain[-1]['hash'], [vote_data], str(datetime.now()))
-            }
-            self.chain.append(new_block)
-        else:
-            self.chain[-1]['votes'].append(vote_data)
-            
-            self.chain[-1]['hash'] = self.calculate_hash(
-                self.chain[-1]['index'],
-                self.chain[-1]['previous_hash'],
-                self.chain[-1]['votes'],
-                self.chain[-1]['timestamp']
-            )
-
-        self.save_chain(self.chain)
-        return True
+        if self.seal_interval is None or self.chain[-1]['hash'] is not None:
+            return None
+        if time.monotonic() - self.open_block_started < self.seal_interval:
+            return None
+        return self._seal_open_block(records)
+
+    def _seal_open_block(self, records):
+        
+        block = self.chain[-1]
+        if block['hash'] is not None or not block['votes']:
+            return None
+
+        merkle_root = self.open_tree.root()
+        sealed = dict(block, merkle_root=merkle_root,
+                      hash=self.calculate_hash(block['index'], block['previous_hash'], merkle_root, block['timestamp']))
+        self._stage(seal_record(sealed), records)
+        return block
 
-    def save_chain(self, chain):
+    def _commit(self, records):
         
-        os.makedirs(os.path.dirname(self.blockchain_file), exist_ok=True)
-        with open(self.blockchain_file, 'w') as f:
-            json.dump(chain, f, indent=2)
+        try:
+            self.journal.append_lines(records)
+        except Exception:
+            self.load_chain()
+            raise
+        finally:
+            self.pending_bytes = 0
+
+    def _notify_sealed(self, sealed_blocks):
+        
+        if self.snapshot_file and sealed_blocks:
+            self.sealed_since_snapshot += len(sealed_blocks)
+            if self.sealed_since_snapshot >= self.snapshot_interval:
+                try:
+                    self.write_snapshot()
+                except Exception as e:
+                    print(f"Error writing chain snapshot: {e}")
+
+        for block in sealed_blocks:
+            for listener in self.seal_listeners:
+                try:
+                    listener(block)
+                except Exception as e:
+                    print(f"Seal listener error for block {block['index']}: {e}")
+
+    def export_chain(self, export_file):
+        
+        directory = os.path.dirname(export_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            self.refresh()
+            with open(export_file, 'w') as f:
+                json.dump(self.chain, f, indent=2, default=chain_json_default)
 
     def get_vote_count(self):
         
-        total = 0
-        for block in self.chain:
-            total += len(block['votes'])
-        return total
+        self.refresh()
+        with self.lock:
+            if not self.chain:
+                return 0
+            return self.block_offsets[-1] + len(self.chain[-1]['votes'])
+
+    def get_hourly_counts(self):
+        
+        self.refresh()
+        with self.lock:
+            return dict(self.hourly_counts)
 
     def has_voted(self, voter_nic):
         
-        for block in self.chain:
-            for vote in block['votes']:
-                if vote['voter_nic'] == voter_nic:
-                    return True
-        return False
+        self.refresh()
+        return voter_nic in self.voter_index
+
+    def get_vote_location(self, voter_nic):
+        
+        self.refresh()
+        return self.voter_index.get(voter_nic)
+
+    def find_vote(self, voter_nic):
+        
+        with self.lock:
+            location = self.get_vote_location(voter_nic)
+            if location is None:
+                return None
+            block_index, position = location
+            return self.chain[block_index]['votes'][position].to_dict()
+
+    def get_vote_number(self, voter_nic):
+        
+        with self.lock:
+            location = self.get_vote_location(voter_nic)
+            if location is None:
+                return None
+            block_index, position = location
+            return self.block_offsets[block_index] + position + 1
+
+    def get_receipt(self, leaf_hash):
+        
+        self.refresh()
+        with self.lock:
+            location = self.leaf_hashes.get(leaf_hash)
+            if location is None:
+                return None
+            block_index, leaf_index = location
+            block = self.chain[block_index]
+
+            receipt = {
+                'block_index': block_index,
+                'leaf_index': leaf_index,
+                'leaf_hash': leaf_hash,
+                'sealed': block['hash'] is not None,
+                'tree_size': None,
+                'proof': None,
+                'merkle_root': block['merkle_root'],
+                'previous_hash': block['previous_hash'],
+                'block_timestamp': block['timestamp'],
+                'block_hash': block['hash']
+            }
+            if block['hash'] is not None and block['merkle_root'] is not None:
+                leaves = [hash_leaf(block_vote.to_dict()) for block_vote in block['votes']]
+                receipt['tree_size'] = len(leaves)
+                receipt['proof'] = inclusion_proof(leaves, leaf_index)
+            return receipt
 
 
 class VoteManager:
@@ -180,12 +576,42 @@ class VoteManager:
         self.registration_pool = config.registration_pool
         self.vote_pool = config.vote_pool
         self.voter_auth_pool = config.voter_auth_pool  
-        self.blockchain = Blockchain(config.BLOCKCHAIN_FILE)
+        self.vote_writers = {}
+        self.vote_writers_lock = threading.Lock()
+        self.template_store = TemplateStore(config.TEMPLATE_STORE_FILE)
+        self.eligibility_cache = EligibilityCache(self.fetch_voter_info, self.fetch_voter_auth_status,
+                                                  config.ELIGIBILITY_CACHE_TTL, self.connect_auth_listener,
+                                                  config.AUTH_NOTIFY_CHANNEL)
+        legacy_chain = Blockchain(config.BLOCKCHAIN_FILE, config.LEGACY_BLOCKCHAIN_FILE,
+                                  config.BLOCK_SIZE, config.BLOCK_SEAL_INTERVAL,
+                                  config.CHAIN_SNAPSHOT_FILE, config.CHAIN_SNAPSHOT_INTERVAL)
+        self.blockchain = ShardedChain(config.CHAIN_SHARD_DIR, config.ANCHOR_CHAIN_FILE, self.create_shard,
+                                       legacy_chain, config.ANCHOR_INTERVAL, self.get_voter_division)
+        self.blockchain.seal_listeners.append(self.record_sealed_block)
         self.init_databases()
+        self.blockchain.start()
+        self.eligibility_cache.start()
+
+    def create_shard(self, shard_file):
+
+        return Blockchain(shard_file, None, config.BLOCK_SIZE, config.BLOCK_SEAL_INTERVAL,
+                          shard_file[:-len('.jsonl')] + '.snapshot', config.CHAIN_SNAPSHOT_INTERVAL)
+
+    def get_vote_writer(self, division):
+
+        with self.vote_writers_lock:
+            if division not in self.vote_writers:
+                writer = GroupCommitWriter(self.blockchain.get_shard(division), self.vote_pool,
+                                           config.VOTE_BATCH_MAX_SIZE, config.VOTE_BATCH_MAX_LATENCY,
+                                           shard=division)
+                writer.start()
+                self.vote_writers[division] = writer
+            return self.vote_writers[division]
 
     def init_databases(self):
         
         self.init_vote_db()
+        self.backfill_sealed_blocks()
 
     def init_vote_db(self):
         
@@ -231,16 +657,91 @@ class VoteManager:
                                    block_hash VARCHAR
                                (
                                    64
-                               ) NOT NULL
+                               ),
+                                   chain_shard VARCHAR
+                               (
+                                   100
+                               ),
+                                   block_index INTEGER,
+                                   leaf_index INTEGER
                                    )
                                ''')
+
+                
+                cursor.execute('''
+                               ALTER TABLE anonymous_votes
+                                   ALTER COLUMN block_hash DROP NOT NULL,
+                                   ADD COLUMN IF NOT EXISTS chain_shard VARCHAR(100),
+                                   ADD COLUMN IF NOT EXISTS block_index INTEGER,
+                                   ADD COLUMN IF NOT EXISTS leaf_index INTEGER
+                               ''')
+                cursor.execute('''
+                               DELETE FROM vote_sessions older
+                                   USING vote_sessions newer
+                               WHERE older.voter_nic = newer.voter_nic
+                                 AND older.session_id < newer.session_id
+                               ''')
+                cursor.execute('''
+                               CREATE UNIQUE INDEX IF NOT EXISTS vote_sessions_voter_nic_key
+                                   ON vote_sessions (voter_nic)
+                               ''')
+                cursor.execute('''
+                               CREATE INDEX IF NOT EXISTS idx_anonymous_votes_unsealed
+                                   ON anonymous_votes (chain_shard, block_index) WHERE block_hash IS NULL
+                               ''')
                 conn.commit()
         except Exception as e:
             print(f"Error initializing vote DB: {e}")
         finally:
             self.vote_pool.putconn(conn)
 
-    def get_voter_info(self, nic):
+    def record_sealed_block(self, division, block):
+        
+        if not self.vote_pool:
+            return
+
+        conn = self.vote_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('''
+                               UPDATE anonymous_votes
+                               SET block_hash = %s
+                               WHERE chain_shard IS NOT DISTINCT FROM %s
+                                 AND block_index = %s
+                                 AND block_hash IS NULL
+                               ''', (block['hash'], division or None, block['index']))
+                conn.commit()
+        except Exception as e:
+            print(f"Error recording sealed block {block['index']} of shard '{division}': {e}")
+            conn.rollback()
+        finally:
+            self.vote_pool.putconn(conn)
+
+    def backfill_sealed_blocks(self):
+        
+        conn = self.vote_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('''
+                               SELECT DISTINCT chain_shard, block_index
+                               FROM anonymous_votes
+                               WHERE block_hash IS NULL
+                               ''')
+                pending = cursor.fetchall()
+        except Exception as e:
+            print(f"Error finding unsealed vote rows: {e}")
+            pending = []
+        finally:
+            self.vote_pool.putconn(conn)
+
+        for division, block_index in pending:
+            division = division or LEGACY_SHARD
+            shard = self.blockchain.shards.get(division)
+            if shard is not None and block_index is not None and block_index < len(shard.chain) \
+                    and shard.is_sealed(block_index):
+                self.record_sealed_block(division, shard.chain[block_index])
+
+    def fetch_voter_info(self, nic):
         
         conn = self.registration_pool.getconn()
         try:
@@ -257,13 +758,11 @@ class VoteManager:
                         'full_name': result[1],
                         'electoral_division': result[2]
                     }
-        except Exception as e:
-            print(f"Error getting voter info: {e}")
+                return None
         finally:
             self.registration_pool.putconn(conn)
-        return None
 
-    def check_voter_auth_status(self, nic):
+    def fetch_voter_auth_status(self, nic):
         
         if not self.voter_auth_pool:
             return False
@@ -281,11 +780,60 @@ class VoteManager:
                 if result:
                     return result[0] == 'APPROVED'
                 return False
+        finally:
+            self.voter_auth_pool.putconn(conn)
+
+    def load_fingerprint_template(self, nic):
+        
+        template = self.template_store.get(nic)
+        if template is not None:
+            return template
+
+        conn = self.registration_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT fingerprint_path FROM voters WHERE nic = %s', (nic,))
+                result = cursor.fetchone()
+        except Exception as e:
+            print(f"Error getting fingerprint path: {e}")
+            return None
+        finally:
+            self.registration_pool.putconn(conn)
+
+        if not result or not result[0]:
+            return None
+
+        image = cv2.imread(os.path.join(config.REGISTRATION_UPLOAD_FOLDER, result[0]), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            print(f"Stored fingerprint for {nic} could not be read")
+            return None
+        return extract_template(image)
+
+    def connect_auth_listener(self):
+        
+        return psycopg2.connect(host=config.DB_HOST, port=config.DB_PORT, user=config.DB_USER,
+                                password=config.DB_PASSWORD, database=config.VOTER_AUTH_DB)
+
+    def get_voter_info(self, nic):
+        
+        try:
+            return self.eligibility_cache.get_voter_info(nic)
+        except Exception as e:
+            print(f"Error getting voter info: {e}")
+            return None
+
+    def get_voter_division(self, nic):
+        
+        voter_info = self.get_voter_info(nic)
+        return voter_info['electoral_division'] if voter_info else None
+
+    def check_voter_auth_status(self, nic):
+        
+        try:
+            return self.eligibility_cache.is_approved(nic)
         except Exception as e:
             print(f"Error checking voter auth status: {e}")
             return False
-        finally:
-            self.voter_auth_pool.putconn(conn)
 
     def cast_vote(self, voter_nic, party_code):
         
@@ -296,59 +844,36 @@ class VoteManager:
         if not self.check_voter_auth_status(voter_nic):
             return False, "Voter not approved for voting"
 
-        
-        blockchain_success = self.blockchain.add_vote(voter_nic)
-        if not blockchain_success:
-            return False, "Failed to record vote in blockchain"
+        voter_info = self.get_voter_info(voter_nic)
+        if not voter_info or not voter_info['electoral_division']:
+            return False, "Voter electoral division not found"
 
         
-        conn = self.vote_pool.getconn()
-        try:
-            with conn.cursor() as cursor:
-                
-                latest_block_hash = self.blockchain.chain[-1]['hash']
-
-                
-                cursor.execute('''
-                               INSERT INTO anonymous_votes (party_code, block_hash)
-                               VALUES (%s, %s) RETURNING vote_id
-                               ''', (party_code, latest_block_hash))
+        return self.get_vote_writer(voter_info['electoral_division']).submit(voter_nic, party_code)
 
-                
-                
-                cursor.execute('SELECT session_id FROM vote_sessions WHERE voter_nic = %s', (voter_nic,))
-                existing_session = cursor.fetchone()
-
-                if existing_session:
-                    
-                    cursor.execute('''
-                                   UPDATE vote_sessions
-                                   SET end_time = CURRENT_TIMESTAMP,
-                                       status   = 'completed'
-                                   WHERE voter_nic = %s
-                                   ''', (voter_nic,))
-                else:
-                    
-                    cursor.execute('''
-                                   INSERT INTO vote_sessions (voter_nic, end_time, status)
-                                   VALUES (%s, CURRENT_TIMESTAMP, 'completed')
-                                   ''', (voter_nic,))
+    def get_vote_stats(self):
+        
+        division_votes = self.blockchain.get_division_counts()
 
-                conn.commit()
-                return True, "Vote recorded successfully"
-        except Exception as e:
-            print(f"Error storing anonymous vote: {e}")
-            conn.rollback()
-            return False, "Failed to store vote"
-        finally:
-            self.vote_pool.putconn(conn)
+        return {
+            'total_votes': sum(division_votes.values()),
+            'division_votes': division_votes,
+            'hourly_votes': self.blockchain.get_hourly_counts()
+        }
 
-    def get_vote_stats(self):
+    def get_ingest_stats(self):
         
-        total_votes = self.blockchain.get_vote_count()
+        with self.vote_writers_lock:
+            writers = dict(self.vote_writers)
 
+        divisions = {division: writer.get_stats() for division, writer in writers.items()}
         return {
-            'total_votes': total_votes
+            'votes_committed': sum(stats['votes_committed'] for stats in divisions.values()),
+            'votes_rejected': sum(stats['votes_rejected'] for stats in divisions.values()),
+            'votes_failed': sum(stats['votes_failed'] for stats in divisions.values()),
+            'votes_per_second': sum(stats['votes_per_second'] for stats in divisions.values()),
+            'divisions': divisions,
+            'eligibility_cache': self.eligibility_cache.get_stats()
         }
 
     def validate_officer_id(self, officer_id):
@@ -0,0 +1,218 @@
+import queue
+import threading
+import time
+from psycopg2.extras import execute_values
+
+
+class PendingVote:
+    __slots__ = ('voter_nic', 'party_code', 'done', 'success', 'message')
+
+    def __init__(self, voter_nic, party_code):
+        self.voter_nic = voter_nic
+        self.party_code = party_code
+        self.done = threading.Event()
+        self.success = False
+        self.message = None
+
+    def resolve(self, success, message):
+        self.success = success
+        self.message = message
+        self.done.set()
+
+
+class GroupCommitWriter:
+    def __init__(self, blockchain, vote_pool, max_batch=64, max_latency=0.005, submit_timeout=30, shard=None):
+        self.blockchain = blockchain
+        self.shard = shard
+        self.vote_pool = vote_pool
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.submit_timeout = submit_timeout
+        self.queue = queue.Queue()
+        self.is_running = False
+        self.stats_lock = threading.Lock()
+        self.started_at = time.time()
+        self.batches_committed = 0
+        self.votes_committed = 0
+        self.votes_rejected = 0
+        self.votes_failed = 0
+        self.largest_batch = 0
+        self.commit_seconds = 0.0
+
+    def start(self):
+
+        if self.is_running:
+            return
+
+        self.is_running = True
+        writer_thread = threading.Thread(target=self._writer_loop)
+        writer_thread.daemon = True
+        writer_thread.start()
+
+    def stop(self):
+
+        self.is_running = False
+
+    def submit(self, voter_nic, party_code):
+
+        if not self.is_running:
+            self.start()
+
+        pending = PendingVote(voter_nic, party_code)
+        self.queue.put(pending)
+
+        if not pending.done.wait(self.submit_timeout):
+            return False, "Timed out waiting for the vote to be recorded"
+        return pending.success, pending.message
+
+    def _writer_loop(self):
+
+        while self.is_running:
+            try:
+                first = self.queue.get(timeout=1)
+            except queue.Empty:
+                self._seal_if_due()
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self.commit_batch(batch)
+
+    def _seal_if_due(self):
+
+        try:
+            self.blockchain.seal_if_due()
+        except Exception as e:
+            print(f"Error sealing overdue block: {e}")
+
+    def commit_batch(self, batch):
+
+        started = time.monotonic()
+
+        try:
+            appended = self.blockchain.add_votes([pending.voter_nic for pending in batch])
+        except Exception as e:
+            print(f"Error appending vote batch to blockchain: {e}")
+            for pending in batch:
+                pending.resolve(False, "Failed to record vote in blockchain")
+            self._record_batch(0, 0, len(batch), started)
+            return
+
+        accepted = []
+        for pending, added in zip(batch, appended):
+            if added:
+                accepted.append(pending)
+            else:
+                pending.resolve(False, "Voter has already voted")
+
+        rejected = len(batch) - len(accepted)
+        if not accepted:
+            self._record_batch(0, rejected, 0, started)
+            return
+
+        if self.store_votes(accepted):
+            for pending in accepted:
+                pending.resolve(True, "Vote recorded successfully")
+            self._record_batch(len(accepted), rejected, 0, started)
+        else:
+            for pending in accepted:
+                pending.resolve(False, "Failed to store vote")
+            self._record_batch(0, rejected, len(accepted), started)
+
+    def store_votes(self, accepted):
+
+        vote_rows = []
+        for pending in accepted:
+            block_index, leaf_index = self.blockchain.get_vote_location(pending.voter_nic)
+            block_hash = self.blockchain.chain[block_index]['hash']
+            vote_rows.append((pending.voter_nic, pending.party_code, self.shard,
+                              block_hash, block_index, leaf_index))
+
+        conn = self.vote_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                execute_values(cursor, '''
+                               WITH batch (voter_nic, party_code, chain_shard, block_hash, block_index, leaf_index)
+                                        AS (VALUES %s),
+                                    stored AS (
+                                        INSERT INTO anonymous_votes (party_code, chain_shard, block_hash,
+                                                                     block_index, leaf_index)
+                                        SELECT party_code, chain_shard, block_hash, block_index, leaf_index
+                                        FROM batch
+                                    )
+                               INSERT INTO vote_sessions (voter_nic, end_time, status)
+                               SELECT voter_nic, CURRENT_TIMESTAMP, 'completed'
+                               FROM batch
+                               ON CONFLICT (voter_nic) DO UPDATE
+                                   SET end_time = EXCLUDED.end_time,
+                                       status   = EXCLUDED.status
+                               ''', vote_rows,
+                               template='(%s::varchar, %s::varchar, %s::varchar, %s::varchar, %s::integer, %s::integer)',
+                               page_size=len(vote_rows))
+
+                conn.commit()
+        except Exception as e:
+            print(f"Error storing anonymous vote batch: {e}")
+            conn.rollback()
+            return False
+        finally:
+            self.vote_pool.putconn(conn)
+
+        self.fill_late_seals(vote_rows)
+        return True
+
+    def fill_late_seals(self, vote_rows):
+
+        unsealed = sorted({block_index for _, _, _, block_hash, block_index, _ in vote_rows if block_hash is None})
+        if not unsealed:
+            return
+
+        self.blockchain.refresh()
+        for block_index in unsealed:
+            if not self.blockchain.is_sealed(block_index):
+                continue
+            block = self.blockchain.chain[block_index]
+            for listener in self.blockchain.seal_listeners:
+                try:
+                    listener(block)
+                except Exception as e:
+                    print(f"Seal listener error for block {block_index}: {e}")
+
+    def _record_batch(self, committed, rejected, failed, started):
+
+        with self.stats_lock:
+            self.batches_committed += 1
+            self.votes_committed += committed
+            self.votes_rejected += rejected
+            self.votes_failed += failed
+            self.largest_batch = max(self.largest_batch, committed + rejected + failed)
+            self.commit_seconds += time.monotonic() - started
+
+    def get_stats(self):
+
+        with self.stats_lock:
+            uptime = max(time.time() - self.started_at, 1e-9)
+            batches = self.batches_committed
+            return {
+                'batches_committed': batches,
+                'votes_committed': self.votes_committed,
+                'votes_rejected': self.votes_rejected,
+                'votes_failed': self.votes_failed,
+                'queue_depth': self.queue.qsize(),
+                'largest_batch': self.largest_batch,
+                'average_batch_size': (self.votes_committed + self.votes_rejected + self.votes_failed) / batches
+                if batches else 0.0,
+                'average_commit_ms': self.commit_seconds / batches * 1000 if batches else 0.0,
+                'votes_per_second': self.votes_committed / uptime,
+                'max_batch': self.max_batch,
+                'max_latency_ms': self.max_latency * 1000
+            }